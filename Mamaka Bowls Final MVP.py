@@ -5,47 +5,636 @@ Date:           4/22/2025
 Purpose:        A system that allows users to order food items from Mamaka Bowls and calculates the total cost.
 """
 #Importing libraries
+import time #timing the startup report
+STARTED_AT = time.perf_counter()
 import tkinter as tk
 from tkinter import ttk, messagebox
-from PIL import Image, ImageTk #importing image manager
-import os, random, re #importing os for file handling, random for the order id, and re for input validation
+import os, re, sys, struct, math #importing os for file handling, re for input validation, sys and struct for the startup flags and image headers, math for percentiles
+import hashlib #hashing source paths for the thumbnail cache
+import queue #handing decoded images from the worker threads back to Tk
+import weakref #labels showing an image are tracked without keeping them alive
+from concurrent.futures import ThreadPoolExecutor #thread pools for background image decoding and menu reloads
+from MamakaOrderEngine import CatalogStore, Pricer, Cart, Order, OrderIdGenerator, kiosk_prefix #menu, pricing, cart and order id logic
+from MamakaOrderJournal import OrderJournal #durable record of confirmed orders
+from MamakaOrderStore import OrderStore #optional order database for staff lookups
+from MamakaOrderSubmitter import OrderSubmitter, write_receipt #saving, receipts and kitchen tickets off the UI thread
+from MamakaKitchenDisplay import KitchenLink, ticket_for, kitchen_address #sending tickets to the kitchen display
+from collections import OrderedDict, deque #ordered dict used as the LRU image cache, deque for queued notifications
+
+#Slow screen builds are logged here, next to this file like the other files the app writes
+SLOW_SCREEN_LOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "slow_screens.log")
+
+#Milestones shown by the --timing startup report
+startup_marks = []
+
+def mark_startup(label):
+    startup_marks.append((label, time.perf_counter() - STARTED_AT))
+
+#Printing how long each startup step took and whether Pillow had to be imported
+def print_startup_report():
+    print("Startup timing:")
+    for label, elapsed in startup_marks:
+        print(f"  {label:<28}{elapsed * 1000:8.1f} ms")
+    if PillowImageBackend.import_time is None:
+        print("  Pillow was not imported")
+    else:
+        print(f"  Pillow import took {PillowImageBackend.import_time * 1000:.1f} ms")
+
+#Loads PNG and GIF files with Tk itself so Pillow is not needed for them
+class TkImageBackend:
+    FORMATS = ('.png', '.gif')
+
+    def can_load(self, path):
+        return path.lower().endswith(self.FORMATS)
+
+    #Reading the width and height from the file header without decoding the image
+    def image_size(self, path):
+        with open(path, 'rb') as f:
+            header = f.read(24)
+        if header[:8] == b'\x89PNG\r\n\x1a\n':
+            return struct.unpack('>II', header[16:24])
+        if header[:6] in (b'GIF87a', b'GIF89a'):
+            return struct.unpack('<HH', header[6:10])
+        return None
+
+    #Scaling by a whole-number factor with subsample/zoom, returns None when the size needs real resampling
+    def scale(self, path, size, fit):
+        dimensions = self.image_size(path)
+        if dimensions is None:
+            return None
+        width, height = dimensions
+        if fit:
+            ratio = min(size[0] / width, size[1] / height, 1)
+            target = (max(1, round(width * ratio)), max(1, round(height * ratio)))
+        else:
+            target = tuple(size)
+        if target == (width, height):
+            return tk.PhotoImage(file=path)
+        if width % target[0] == 0 and height % target[1] == 0 and width // target[0] == height // target[1]:
+            return tk.PhotoImage(file=path).subsample(width // target[0])
+        if target[0] % width == 0 and target[1] % height == 0 and target[0] // width == target[1] // height:
+            return tk.PhotoImage(file=path).zoom(target[0] // width)
+        return None
+
+#Pillow is only imported the first time an image needs high quality resampling or JPEG decoding
+class PillowImageBackend:
+    import_time = None
+
+    def __init__(self):
+        started = time.perf_counter()
+        from PIL import Image, ImageTk
+        if PillowImageBackend.import_time is None:
+            PillowImageBackend.import_time = time.perf_counter() - started
+        self.Image = Image
+        self.ImageTk = ImageTk
+
+    #Opening the original file in a mode that can be saved as PNG
+    def open(self, path):
+        image = self.Image.open(path)
+        if image.mode not in ("1", "L", "LA", "P", "RGB", "RGBA"):
+            image = image.convert("RGBA")
+        return image
+
+    def to_photo(self, image):
+        return self.ImageTk.PhotoImage(image)
 
 #This class will be used to hold the images load them when they are called
 class ImageManager: 
-    def __init__(self, image_folder='images', size=(80, 80)):
+    #Standard sizes every image is pre-scaled to, other sizes are resampled from the nearest larger one
+    VARIANT_SIZES = (40, 80, 120, 160, 240)
+
+    def __init__(self, image_folder='images', size=(80, 80), cache_size=32, lazy=False, preload=(), cache_folder=None, master=None, workers=0, memory_budget=None):
         self.image_folder = image_folder
+        #Pre-scaled copies of the images are saved here so a restart can skip resampling
+        self.cache_folder = cache_folder or os.path.join(image_folder, '.thumbnails')
         self.default_size = size
-        self.images = {}
-        self.load_images()
+        self.images = OrderedDict()
+        self.index = {}
+        #Tk handles PNG/GIF at whole-number scale factors, Pillow is created on first real need
+        self.tk_backend = TkImageBackend()
+        self.pillow_backend = None
+        #Decoded bytes held per image, unused images are evicted once the budget is exceeded
+        self.memory_budget = memory_budget
+        self.memory_used = 0
+        self.image_bytes = {}
+        self.active = set()
+        self.evictions = 0
+        #Labels showing each stored image, evicting an image takes it off them so its memory is really freed
+        self.labels = {}
+        #Resized images are kept in a bounded LRU cache keyed by (key, size)
+        self.cache_size = cache_size
+        self.resized_cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        #With workers set, images are decoded on a thread pool and handed to the Tk thread through a queue
+        self.master = master
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image") if workers and master else None
+        self.decoded = queue.Queue()
+        self.pending = {}
+        self.placeholder = None
+        self.polling = False
+        #In lazy mode only the filename index is built at startup and images are decoded on first use
+        self.lazy = lazy
+        if lazy:
+            self.build_index()
+            for key in preload:
+                self.load_image(key)
+        else:
+            self.load_images()
 
-    #loading images from the given folder
-    def load_images(self): 
+    #Mapping image names to their file paths without decoding anything
+    def build_index(self):
+        self.index = {}
         for filename in os.listdir(self.image_folder):
             if filename.lower().endswith(('.png', '.jpg', '.jpeg', '.gif')):
                 name = os.path.splitext(filename)[0].lower()
-                path = os.path.join(self.image_folder, filename)
+                self.index[name] = os.path.join(self.image_folder, filename)
+        return self.index
+
+    #loading images from the given folder
+    def load_images(self): 
+        for name in self.build_index():
+            self.load_image(name)
+
+    #Decoding a single image at the default size
+    def load_image(self, key):
+        name = key.lower()
+        path = self.index.get(name)
+        if path is None:
+            return None
+        try:
+            image = self.scale_image(path, self.default_size, fit=True)
+        except Exception as e:
+            print(f'Failed to load {os.path.basename(path)}: {e}')
+            return None
+        return self.remember(self.images, name, image)
+
+    #Building the disk cache filename from the source path, its mtime and the target size
+    def cache_path(self, path, size, fit):
+        name = os.path.splitext(os.path.basename(path))[0].lower()
+        source = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:10]
+        mode = "fit" if fit else "exact"
+        prefix = f"{name}-{source}-{size[0]}x{size[1]}-{mode}-"
+        return prefix, os.path.join(self.cache_folder, f"{prefix}{os.stat(path).st_mtime_ns}.png")
+
+    #Pillow backend, imported the first time it is needed
+    @property
+    def pillow(self):
+        if self.pillow_backend is None:
+            self.pillow_backend = PillowImageBackend()
+        return self.pillow_backend
+
+    #Scaling an image, reusing the cached PNG when the source file has not changed
+    def scale_image(self, path, size, fit=False):
+        prefix, cached = self.cache_path(path, size, fit)
+        if not os.path.exists(cached) and self.tk_backend.can_load(path):
+            #Whole-number scale factors are done by Tk without importing Pillow
+            photo = self.tk_backend.scale(path, size, fit)
+            if photo is not None:
+                self.write_cached(path, prefix, cached, lambda temp: photo.write(temp, format="png"))
+                return photo
+        return self.to_photo(self.prepare_image(path, size, fit))
+
+    #Turning a prepared image into a PhotoImage, this has to run on the Tk thread
+    def to_photo(self, prepared):
+        if isinstance(prepared, str):
+            #Tk reads PNG natively so a cache hit needs no PIL work at all
+            return tk.PhotoImage(file=prepared)
+        return self.pillow.to_photo(prepared)
+
+    #Decoding and scaling without touching Tk so it is safe to call from a worker thread
+    def prepare_image(self, path, size, fit=False):
+        prefix, cached = self.cache_path(path, size, fit)
+        if os.path.exists(cached):
+            return cached
+
+        #Starting from the nearest larger pre-scaled variant keeps the final resample cheap
+        source, is_variant = self.nearest_variant(path, size, fit)
+        if os.path.exists(cached):
+            #The request matched one of the standard variants exactly
+            return cached
+        Image = self.pillow.Image
+        resample = Image.BILINEAR if is_variant else Image.LANCZOS
+        if fit:
+            source.thumbnail(size, resample)
+            image = source
+        else:
+            image = source.resize(size, resample)
+        return self.save_cached(image, path, prefix, cached)
+
+    #Picking the smallest standard variant that is still at least as big as the requested size
+    def nearest_variant(self, path, size, fit):
+        for variant_size in self.VARIANT_SIZES:
+            if variant_size < max(size):
+                continue
+            prefix, cached = self.cache_path(path, (variant_size, variant_size), True)
+            if not os.path.exists(cached):
+                self.build_variants(path)
+            if not os.path.exists(cached):
+                break
+            variant = self.pillow.Image.open(cached)
+            #A variant keeps the aspect ratio, so for an exact size both sides have to be big enough
+            if fit or (variant.width >= size[0] and variant.height >= size[1]):
+                variant.load()
+                return variant, True
+        return self.pillow.open(path), False
+
+    #Writing every standard size of an image to the disk cache from a single decode
+    def build_variants(self, path):
+        image = self.pillow.open(path)
+        for variant_size in sorted(self.VARIANT_SIZES, reverse=True):
+            #Each variant is scaled down from the previous, slightly larger one
+            image.thumbnail((variant_size, variant_size), self.pillow.Image.LANCZOS)
+            prefix, cached = self.cache_path(path, (variant_size, variant_size), True)
+            if not os.path.exists(cached):
+                self.save_cached(image.copy(), path, prefix, cached)
+
+    #Saving a scaled image to the disk cache
+    def save_cached(self, image, path, prefix, cached):
+        self.write_cached(path, prefix, cached, lambda temp: image.save(temp, "PNG"))
+        image.load()
+        return image
+
+    #Writing a cache entry and replacing any entries for older versions of the same source
+    def write_cached(self, path, prefix, cached, write):
+        try:
+            os.makedirs(self.cache_folder, exist_ok=True)
+            for filename in os.listdir(self.cache_folder):
+                if filename.startswith(prefix) and not filename.startswith(os.path.basename(cached)):
+                    os.remove(os.path.join(self.cache_folder, filename))
+            temp = cached + ".tmp"
+            write(temp)
+            os.replace(temp, cached)
+        except (OSError, tk.TclError) as e:
+            print(f"Could not write thumbnail cache for {os.path.basename(path)}: {e}")
+
+    #Blank image shown in place of a picture that is still being decoded
+    def get_placeholder(self):
+        if self.placeholder is None:
+            self.placeholder = tk.PhotoImage(width=self.default_size[0], height=self.default_size[1])
+        return self.placeholder
+
+    #Asking for an image without blocking, the callback gets the PhotoImage (or None) once it is ready
+    def request_image(self, key, callback):
+        name = key.lower()
+        image = self.images.get(name)
+        if image is not None or self.executor is None or name not in self.index:
+            callback(image if image is not None else self.get_image(key))
+            return
+        self.submit(name).append(callback)
+
+    #Decoding a few images in the background so the menu they belong to is ready before it is opened
+    def prefetch(self, keys):
+        for name in keys:
+            name = name.lower()
+            if self.executor is not None and name in self.index and name not in self.images:
+                self.submit(name)
+
+    #Queueing a decode for a worker thread and returning the list of callbacks waiting on it
+    def submit(self, name):
+        if name not in self.pending:
+            self.pending[name] = []
+            self.executor.submit(self.decode_in_background, name, self.index[name])
+            if not self.polling:
+                self.polling = True
+                self.master.after(15, self.drain_decoded)
+        return self.pending[name]
+
+    #Worker thread body, the result is only queued because Tk objects must be made on the Tk thread
+    def decode_in_background(self, name, path):
+        try:
+            self.decoded.put((name, self.prepare_image(path, self.default_size, fit=True), None))
+        except Exception as e:
+            self.decoded.put((name, None, e))
+
+    #Polled with after() to turn decoded images into PhotoImages a few at a time
+    def drain_decoded(self, batch=8):
+        for _ in range(batch):
+            try:
+                name, prepared, error = self.decoded.get_nowait()
+            except queue.Empty:
+                break
+            image = None
+            if error is None:
                 try:
-                    image = Image.open(path)
-                    image.thumbnail(self.default_size)
-                    self.images[name] = ImageTk.PhotoImage(image)
+                    image = self.remember(self.images, name, self.to_photo(prepared))
                 except Exception as e:
-                    print(f'Failed to load {filename}: {e}')
+                    error = e
+            if error is not None:
+                print(f'Failed to load {os.path.basename(self.index[name])}: {error}')
+            for callback in self.pending.pop(name, []):
+                callback(image)
+        if self.pending:
+            self.master.after(15, self.drain_decoded)
+        else:
+            self.polling = False
+
+    #Stopping the worker threads when the app closes
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
 
     #Retrieve and resizing images
     def get_image(self, key, size=None): 
-        image = self.images.get(key.lower())
-        if image and size:
+        name = key.lower()
+        image = self.images.get(name)
+        if image is not None:
+            self.images.move_to_end(name)
+        if size and name in self.index:
+            cache_key = (name, tuple(size))
+            cached = self.resized_cache.get(cache_key)
+            if cached is not None:
+                #Mark as most recently used so it is evicted last
+                self.resized_cache.move_to_end(cache_key)
+                self.cache_hits += 1
+                return cached
+            self.cache_misses += 1
             try:
-                original_image = Image.open(os.path.join(self.image_folder, f"{key.lower()}.png"))
-                resized_image = original_image.resize(size, Image.LANCZOS)
-                return ImageTk.PhotoImage(resized_image)
+                resized = self.scale_image(self.index[name], tuple(size))
             except Exception as e:
                 print(f"Error resizing image {key}: {e}")
                 return image
+            self.remember(self.resized_cache, cache_key, resized)
+            #Evict the least recently used image once the cache is full
+            while len(self.resized_cache) > self.cache_size:
+                self.evict(self.resized_cache, next(iter(self.resized_cache)))
+            return resized
+        if image is None and self.lazy:
+            image = self.load_image(key)
         return image
 
+    #Storing a decoded image and counting its pixels against the memory budget
+    def remember(self, store, key, image):
+        store[key] = image
+        store.move_to_end(key)
+        self.forget(key)
+        self.image_bytes[key] = image.width() * image.height() * 4
+        self.memory_used += self.image_bytes[key]
+        self.enforce_budget()
+        return image
+
+    #Removing an image from the memory accounting
+    def forget(self, key):
+        self.memory_used -= self.image_bytes.pop(key, 0)
+
+    #Putting a stored image on a label and remembering that it is shown there
+    def show(self, label, key, image):
+        label.configure(image=image)
+        label.image = image
+        self.labels.setdefault(key, weakref.WeakSet()).add(label)
+
+    #Dropping an image from a store, labels still showing it (e.g. on a cached screen) get the placeholder instead
+    def evict(self, store, key):
+        image = store.pop(key)
+        self.forget(key)
+        for label in list(self.labels.pop(key, ())):
+            if getattr(label, "image", None) is image and label.winfo_exists():
+                placeholder = self.get_placeholder()
+                label.configure(image=placeholder)
+                label.image = placeholder
+
+    #Telling the manager which images are on screen so they are never evicted
+    def set_active(self, keys):
+        self.active = {key.lower() for key in keys}
+        self.enforce_budget()
+
+    #Evicting the least recently used images that are not on screen until usage fits the budget
+    def enforce_budget(self):
+        if self.memory_budget is None:
+            return
+        #Resized copies go first since they are cheap to rebuild from the disk cache
+        for store in (self.resized_cache, self.images):
+            for key in list(store):
+                if self.memory_used <= self.memory_budget:
+                    return
+                name = key[0] if isinstance(key, tuple) else key
+                if name in self.active:
+                    continue
+                self.evict(store, key)
+                self.evictions += 1
+
+    #Current decoded image memory for monitoring
+    def memory_usage(self):
+        return {
+            "used": self.memory_used,
+            "budget": self.memory_budget,
+            "images": len(self.image_bytes),
+            "active": len(self.active),
+            "evictions": self.evictions
+        }
+
+    #Hit/miss counters for the resized image cache
+    def cache_stats(self):
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "size": len(self.resized_cache),
+            "capacity": self.cache_size
+        }
+
+#Scrolling list on a canvas that only creates widgets for the visible rows and reuses them while scrolling
+class VirtualList(ttk.Frame):
+    def __init__(self, parent, row_height, create_row, bind_row, max_visible_rows=4, gap=10):
+        super().__init__(parent, style="TFrame")
+        self.row_height = row_height
+        self.create_row = create_row
+        self.bind_row = bind_row
+        self.max_visible_rows = max_visible_rows
+        self.gap = gap
+        self.count = 0
+        #Each pooled row is [widget, canvas window id, index it currently shows]
+        self.rows = []
+        self.canvas = tk.Canvas(self, bg="lightblue", highlightthickness=0, height=0)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.canvas.bind("<Configure>", lambda e: self.refresh(force=True))
+        #The mouse wheel scrolls the list while the pointer is over it
+        self.bind("<Enter>", lambda e: self.bind_wheel(True))
+        self.bind("<Leave>", lambda e: self.bind_wheel(self.pointer_inside()))
+
+    #Moving onto a row also counts as leaving the frame, so check where the pointer really is
+    def pointer_inside(self):
+        widget = self.winfo_containing(*self.winfo_pointerxy())
+        return widget is not None and str(widget).startswith(str(self))
+
+    def bind_wheel(self, active):
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            if active:
+                self.bind_all(sequence, self.on_wheel)
+            else:
+                self.unbind_all(sequence)
+
+    def on_wheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self.yview("scroll", -1, "units")
+        else:
+            self.yview("scroll", 1, "units")
+
+    def yview(self, *args):
+        self.canvas.yview(*args)
+        self.refresh()
+
+    #Changing how many rows the list has, only the visible ones are rebound
+    def set_count(self, count):
+        self.count = count
+        self.canvas.configure(height=min(count, self.max_visible_rows) * self.row_height,
+                              scrollregion=(0, 0, 0, count * self.row_height),
+                              yscrollincrement=self.row_height // 2)
+        self.refresh(force=True)
+
+    #Rebinding one row after its data changed, does nothing if it is scrolled out of view
+    def update_row(self, index):
+        for row in self.rows:
+            if row[2] == index:
+                self.bind_row(row[0], index)
+
+    #Placing pooled row widgets at the visible positions, rows that scrolled away are reused first
+    def refresh(self, force=False):
+        top = self.canvas.canvasy(0)
+        height = max(self.canvas.winfo_height(), int(self.canvas.cget("height")))
+        first = max(0, int(top // self.row_height))
+        last = min(self.count, int((top + height) // self.row_height) + 1)
+        visible = range(first, last)
+        if force:
+            for row in self.rows:
+                row[2] = None
+        shown = {row[2] for row in self.rows if row[2] in visible}
+        free = [row for row in self.rows if row[2] not in visible]
+        width = self.canvas.winfo_width()
+        for index in visible:
+            if index in shown:
+                continue
+            if free:
+                row = free.pop()
+            else:
+                widget = self.create_row(self.canvas)
+                row = [widget, self.canvas.create_window(0, 0, window=widget, anchor="nw"), None]
+                self.rows.append(row)
+            self.bind_row(row[0], index)
+            row[2] = index
+            self.canvas.coords(row[1], 0, index * self.row_height)
+            self.canvas.itemconfigure(row[1], state="normal", width=width, height=self.row_height - self.gap)
+        for row in free:
+            self.canvas.itemconfigure(row[1], state="hidden")
+            row[2] = None
+
+#Non-blocking notifications shown at the bottom of the window, queued messages are shown one after another
+class ToastManager:
+    def __init__(self, master, duration=1800, fade_steps=8, fade_interval=40, bg="#333333", fg="white"):
+        self.master = master
+        self.duration = duration
+        self.fade_steps = fade_steps
+        self.fade_interval = fade_interval
+        self.bg = bg
+        self.fg = fg
+        self.messages = deque()
+        self.label = None
+        self.showing = False
+
+    #Queueing a message, it is shown right away if nothing else is on screen
+    def show(self, message):
+        self.messages.append(message)
+        if not self.showing:
+            self.show_next()
+
+    def show_next(self):
+        if not self.messages:
+            self.showing = False
+            if self.label is not None:
+                self.label.place_forget()
+            return
+        self.showing = True
+        if self.label is None or not self.label.winfo_exists():
+            self.label = tk.Label(self.master, font=("Segoe UI", 11), padx=14, pady=8, wraplength=420)
+        self.label.configure(text=self.messages.popleft(), bg=self.bg, fg=self.fg)
+        self.label.place(relx=0.5, rely=0.97, anchor="s")
+        self.label.lift()
+        self.master.after(self.duration, self.fade, 1)
+
+    #Blending the toast into the window background a step at a time, then moving on to the next message
+    def fade(self, step):
+        if self.label is None or not self.label.winfo_exists():
+            self.show_next()
+            return
+        if step > self.fade_steps:
+            self.show_next()
+            return
+        target = self.master.cget("bg")
+        self.label.configure(bg=self.blend(self.bg, target, step / self.fade_steps),
+                             fg=self.blend(self.fg, target, step / self.fade_steps))
+        self.master.after(self.fade_interval, self.fade, step + 1)
+
+    def blend(self, start, end, amount):
+        start_rgb = self.master.winfo_rgb(start)
+        end_rgb = self.master.winfo_rgb(end)
+        return "#" + "".join(f"{int(a + (b - a) * amount) >> 8:02x}" for a, b in zip(start_rgb, end_rgb))
+
+#Times each screen from the navigation call until Tk is next idle and logs the slow ones
+class ScreenTimer:
+    def __init__(self, master, window=200, slow_threshold=0.25, log_path=SLOW_SCREEN_LOG):
+        self.master = master
+        self.window = window
+        self.slow_threshold = slow_threshold
+        self.log_path = log_path
+        self.samples = {}
+
+    #Wrapping a screen builder so every call is timed
+    def wrap(self, name, builder):
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return builder(*args, **kwargs)
+            finally:
+                self.master.after_idle(self.finish, name, started)
+        return timed
+
+    #Idle callback, by now the screen has been built and laid out
+    def finish(self, name, started):
+        elapsed = time.perf_counter() - started
+        self.samples.setdefault(name, deque(maxlen=self.window)).append(elapsed)
+        if elapsed > self.slow_threshold:
+            self.log_slow(name, elapsed)
+
+    def log_slow(self, name, elapsed):
+        try:
+            with open(self.log_path, "a") as log:
+                log.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')}\t{name}\t{elapsed * 1000:.1f} ms\t{self.count_widgets(self.master)} widgets\n")
+        except OSError as e:
+            print(f"Could not write slow screen log: {e}")
+
+    def count_widgets(self, widget):
+        return 1 + sum(self.count_widgets(child) for child in widget.winfo_children())
+
+    #p50/p95/p99 over the most recent samples for each screen, in milliseconds
+    def percentiles(self):
+        report = {}
+        for name, samples in self.samples.items():
+            ordered = sorted(samples)
+            report[name] = {"count": len(ordered)}
+            for label, fraction in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99)):
+                rank = max(0, math.ceil(fraction * len(ordered)) - 1)
+                report[name][label] = ordered[rank] * 1000
+        return report
+
+    def print_report(self):
+        print("Screen render times (ms):")
+        for name, stats in sorted(self.percentiles().items()):
+            print(f"  {name:<22}n={stats['count']:<5}p50={stats['p50']:7.1f}  p95={stats['p95']:7.1f}  p99={stats['p99']:7.1f}")
+
 #Main application class
 class MamakaBowlsApp(tk.Tk): 
+    #Navigation methods that build a screen, each one is timed by the ScreenTimer
+    SCREEN_BUILDERS = ("create_home_page", "show_menu_page", "show_add_ons", "view_cart_page", "go_to_customer_info",
+                       "go_to_payment_info", "show_checkout", "place_order", "show_faq_page")
+    #How often the menu file is checked for changes
+    CATALOG_POLL_MS = 3000
+    #How often finished order submissions are collected
+    SUBMISSION_POLL_MS = 100
+    #Seconds a submitter worker waits for the journal before reporting the order as not saved
+    JOURNAL_TIMEOUT = 10
+
     def __init__(self):
         super().__init__() 
         self.title("Mamaka Bowls Online Ordering System")
@@ -60,72 +649,182 @@ class MamakaBowlsApp(tk.Tk):
         self.style.configure("TFrame", background="lightblue") 
         #Defining the fonts and theme styles
 
-        self.image_manager = ImageManager()
-
-        #Assigning item names to image filenames
-        self.image_aliases = { 
-            'larry bowl': 'larry',
-            'bean bowl': 'bean',
-            'bro bowl': 'bro',
-            'mamaka bowl': 'mamaka',
-            'mamaka': 'mamakasmo',
-            'larry': 'larrysmo',
-            'bean': 'beansmo',
-            'bro': 'brosmo',
-            'matcha': 'matcha',
-            'latte': 'coffee',
-            'cappuccino': 'coffee',
-            'americano': 'coffee',
-            'breakfast tacos': 'taco'
-        } 
-
-        self.menu_items = { #Defining the different menu items to their categories
-            "Bowls": ["Mamaka Bowl", "Larry Bowl", "Bean Bowl", "Bro Bowl"],
-            "Smoothies": ["Mamaka", "Larry", "Bean", "Bro"],
-            "Coffee": ["Latte", "Cappuccino", "Americano", "Matcha"],
-            "Tacos": ["Breakfast Tacos"]
-        }
-
-        self.add_ons = ["Strawberry", "Peanut Butter", "Agave", "Coconut Flakes", "Chia Seeds", "Bananas"] #List for the add-ons
-
-        self.bowl_prices = { #Dictionary to assign prices to the sizes of the bowls
-            "Small": 9.50,
-            "Regular": 11.00
-        }
-
-        self.prices = { #Assigning prices to the different menu items
-            "Mamaka": 6.50,
-            "Larry": 6.50,
-            "Bean": 6.50,
-            "Bro": 6.50,
-            "Latte": 4.75,
-            "Cappuccino": 4.50,
-            "Americano": 3.50,
-            "Matcha": 5.00,
-            "Breakfast Tacos": 3.25,
-            "Strawberry": 0.50,
-            "Peanut Butter": 0.50,
-            "Agave": 0.50,
-            "Coconut Flakes": 0.50,
-            "Chia Seeds": 0.50,
-            "Bananas": 0.50
-        }
+        #Only the logo is needed for the home page, other images are decoded when their menu page asks for them
+        self.image_manager = ImageManager(lazy=True, preload=("logo",), master=self, workers=4, memory_budget=8 * 1024 * 1024)
+        mark_startup("image manager ready")
+
+        #Menu, pricing and cart logic live in the order engine, the screens only display them
+        #The store holds the newest menu, each session keeps the catalog its cart started with
+        self.catalog_store = CatalogStore()
+        self.catalog_loader = ThreadPoolExecutor(max_workers=1)
+        self.catalog_check = None
+        #Set when staff force a reload while a check is still running, the forced one starts as soon as it ends
+        self.catalog_force = False
+        self.screens = {}
+        self.screen_refreshers = {}
+        self.menu_lists = {}
+        self.current_screen = None
 
         #Cart and order data holders
-        self.cart = {}
+        self.start_session(self.catalog_store.current)
+        #Warming up just the first category in the background, it is the menu most customers open first
+        first_category = next(iter(self.catalog.render_model), None)
+        if first_category is not None:
+            self.image_manager.prefetch(entry.image_key for entry in self.catalog.render_model[first_category])
+        self.cart_view = None
+        self.toasts = ToastManager(self)
         self.customer_info = {}
         self.payment_info = {}
         self.order_id = None
+        self.last_order = None
+        #Every confirmed order is appended here, replaying the journal brings back the orders placed before a restart
+        self.journal = OrderJournal()
+        #The order database is optional, started with --order-db so staff can look orders up by id or phone
+        self.order_store = OrderStore() if "--order-db" in sys.argv else None
+        #Order ids carry this kiosk's name (--kiosk=NAME or the host name) and carry on after the last id in the journal
+        self.order_ids = OrderIdGenerator.resume(kiosk_prefix(), self.journal.orders)
+        #Confirmed orders are saved and get their receipt on worker threads, problems come back through poll_submissions
+        self.submitter = OrderSubmitter(workers=2)
+        self.submitter.add_step("journal", lambda order: self.journal.append(order).result(self.JOURNAL_TIMEOUT))
+        if self.order_store is not None:
+            self.submitter.add_step("database", self.order_store.save)
+        self.submitter.add_step("receipt", write_receipt)
+        #Tickets go to the kitchen display through a buffered link that reconnects by itself, set with --kitchen=host:port.
+        #Each line's station was recorded when the order was placed, so a menu swapped in meanwhile can not move it
+        self.kitchen = KitchenLink(kitchen_address())
+        self.submitter.add_step("kitchen", lambda order: self.kitchen.send(ticket_for(order)))
         self.current_category = None
         self.selected_addons = []
         self.selected_bowl_size = tk.StringVar(value="Regular") 
+
+        #Static screens are built once and kept stacked in this container, switching raises one of them
+        self.screen_container = ttk.Frame(self, style="TFrame")
+        self.screen_container.pack(fill="both", expand=True)
+        self.screen_container.grid_rowconfigure(0, weight=1)
+        self.screen_container.grid_columnconfigure(0, weight=1)
+        self.dynamic_screen = None
+        self.screen_timer = ScreenTimer(self)
+        for name in self.SCREEN_BUILDERS:
+            setattr(self, name, self.screen_timer.wrap(name, getattr(self, name)))
         #Loading the main home page
         self.create_home_page()
-
-    #Function to clear all widgets from the window
+        #Admin shortcut to load the menu file again straight away, otherwise it is checked every few seconds
+        self.bind_all("<Control-R>", lambda e: self.check_catalog(force=True))
+        self.after(self.CATALOG_POLL_MS, self.poll_catalog)
+        self.after(self.SUBMISSION_POLL_MS, self.poll_submissions)
+
+    #Starting a new session on a catalog, with a new cart priced from it
+    def start_session(self, catalog):
+        self.catalog = catalog
+        self.pricer = Pricer(catalog)
+        self.menu_items = catalog.menu_items
+        self.add_ons = catalog.add_ons
+        self.bowl_prices = catalog.bowl_prices
+        self.cart = Cart(self.pricer)
+        self.cart.subscribe(self.on_cart_changed)
+        #Cached screens show the old menu, they are built again on their next visit
+        for frame in self.screens.values():
+            frame.destroy()
+        self.screens.clear()
+        self.screen_refreshers.clear()
+        self.menu_lists.clear()
+
+    #Reporting orders the submitter could not fully process, runs on a timer on the UI thread
+    def poll_submissions(self):
+        for submission in self.submitter.poll():
+            if not submission.ok:
+                self.toasts.show(f"Order {submission.order.order_id}: {', '.join(submission.failures)} failed")
+                print(f"Order {submission.order.order_id} failed: {submission.failures}", file=sys.stderr)
+        self.after(self.SUBMISSION_POLL_MS, self.poll_submissions)
+
+    #Checking the menu file on a timer, the file is read and compiled on the loader thread
+    def poll_catalog(self):
+        try:
+            self.check_catalog()
+        finally:
+            self.after(self.CATALOG_POLL_MS, self.poll_catalog)
+
+    #Starting a background check of the menu file, one check runs at a time and a forced one waits for its turn
+    def check_catalog(self, force=False):
+        self.catalog_force = self.catalog_force or force
+        if self.catalog_check is not None:
+            return
+        forced, self.catalog_force = self.catalog_force, False
+        self.catalog_check = self.catalog_loader.submit(self.catalog_store.reload, forced)
+        self.catalog_check.add_done_callback(lambda check: self.catalog_checked(check, forced))
+
+    #Loader thread callback, the result is handed to the Tk thread straight away instead of waiting for the next poll
+    def catalog_checked(self, check, forced):
+        try:
+            self.after(0, self.finish_catalog_check, check, forced)
+        except (RuntimeError, tk.TclError):
+            #The window has already closed, there is nothing left to update
+            pass
+
+    #Swapping in the catalog a finished check loaded, then starting a forced check that was asked for meanwhile
+    def finish_catalog_check(self, check, forced):
+        self.catalog_check = None
+        try:
+            self.apply_catalog(check, forced)
+        finally:
+            if self.catalog_force:
+                self.check_catalog()
+
+    def apply_catalog(self, check, forced):
+        try:
+            catalog = check.result()
+        except Exception as error:
+            #A bad menu file leaves the current menu in place, customers only see this when staff forced the reload
+            print(f"Menu not updated: {error}", file=sys.stderr)
+            if forced:
+                self.toasts.show(f"Menu not updated: {error}")
+            return
+        if catalog is None:
+            if forced:
+                self.toasts.show("Menu unchanged")
+            return
+        self.catalog_store.swap(catalog)
+        if forced:
+            self.toasts.show(f"Menu {catalog.version} loaded")
+        #Nobody is ordering, so the home page can switch to the new menu now
+        if not self.cart and self.current_screen == "home":
+            self.create_home_page()
+
+    #Function to clear the current screen, cached screens stay alive underneath
     def clear_frame(self):
-        for widget in self.winfo_children():
-            widget.destroy()
+        if self.dynamic_screen is not None:
+            self.dynamic_screen.destroy()
+            self.dynamic_screen = None
+        #Only the logo is on every screen, menu pages add their own images
+        self.image_manager.set_active(("logo",))
+
+    #Creating the frame for a new screen, named screens are cached and raised again on later visits
+    def new_screen(self, name=None, refresh=None):
+        self.clear_frame()
+        frame = ttk.Frame(self.screen_container, padding=20, style="TFrame")
+        frame.grid(row=0, column=0, sticky="nsew")
+        frame.tkraise()
+        self.current_screen = name
+        if name is None:
+            self.dynamic_screen = frame
+        else:
+            self.screens[name] = frame
+            if refresh:
+                self.screen_refreshers[name] = refresh
+        return frame
+
+    #Raising a cached screen and running its refresh hook, returns False if it has not been built yet
+    def raise_screen(self, name):
+        frame = self.screens.get(name)
+        if frame is None:
+            return False
+        self.clear_frame()
+        frame.tkraise()
+        self.current_screen = name
+        refresh = self.screen_refreshers.get(name)
+        if refresh:
+            refresh()
+        return True
 
     #displaying the logo on the given frame
     def display_logo(self, parent):
@@ -135,6 +834,13 @@ class MamakaBowlsApp(tk.Tk):
             logo_label.image = logo
             logo_label.pack(pady=(0, 10))
 
+    #Replacing a placeholder once the real image is ready, the card may be gone or showing another item by then
+    def swap_image(self, card, key, image):
+        if not card.winfo_exists() or card.image_key != key:
+            return
+        if image:
+            self.image_manager.show(card.img_label, key.lower(), image)
+
     #Creating the footer with the navigation buttons
     def create_footer(self, parent):
         footer = ttk.Frame(parent, style="TFrame")
@@ -145,9 +851,12 @@ class MamakaBowlsApp(tk.Tk):
 
     #Displaying the home screen with the category buttons
     def create_home_page(self):
-        self.clear_frame()
-        frame = ttk.Frame(self, padding=20, style="TFrame")
-        frame.pack(fill="both", expand=True)
+        #A new session starts on the home page with an empty cart, it picks up the newest menu
+        if not self.cart and self.catalog is not self.catalog_store.current:
+            self.start_session(self.catalog_store.current)
+        if self.raise_screen("home"):
+            return
+        frame = self.new_screen("home")
 
         self.display_logo(frame)
         ttk.Label(frame, text="Welcome to Mamaka Bowls!", font=("Segoe UI", 16, "bold"), style="TLabel").pack(pady=20)
@@ -168,56 +877,84 @@ class MamakaBowlsApp(tk.Tk):
         self.create_footer(frame)
 
     def show_menu_page(self, category):
-        self.clear_frame()
-        self.current_category = category
-        frame = ttk.Frame(self, padding=20, style="TFrame")
-        frame.pack(fill="both", expand=True)
+        if self.raise_screen(f"menu:{category}"):
+            return
+        frame = self.new_screen(f"menu:{category}", refresh=lambda: self.enter_menu_page(category))
+        self.enter_menu_page(category)
 
         self.display_logo(frame)
         ttk.Label(frame, text=f"{category} Menu", font=("Segoe UI", 16, "bold"), style="TLabel").pack(pady=10)
 
         if category == "Bowls":
             # Show pricing information in red under the header
-            ttk.Label(frame, text="Small: $9.50   Regular: $11.00", foreground="red", font=("Segoe UI", 11, "bold"), style="TLabel").pack(pady=(0, 10))
-
-        for name in self.menu_items[category]:
-            card = ttk.Frame(frame, relief="ridge", borderwidth=2, padding=8, style="TFrame")
-            card.pack(fill="x", pady=5)
-
-            alias = self.image_aliases.get(name.lower(), name.lower().replace(" ", ""))
-            image = self.image_manager.get_image(alias)
-            if image:
-                img_label = tk.Label(card, image=image, bg="lightblue")
-                img_label.image = image
-                img_label.pack(side="left")
+            ttk.Label(frame, text=self.catalog.size_price_text, foreground="red", font=("Segoe UI", 11, "bold"), style="TLabel").pack(pady=(0, 10))
 
-            info_frame = ttk.Frame(card, style="TFrame")
-            info_frame.pack(side="left", padx=10, fill="x", expand=True)
+        #Only the cards that fit on screen are created, they are reused as the list scrolls
+        self.create_footer(frame)
+        menu_list = VirtualList(frame, row_height=112, create_row=lambda parent: self.create_menu_card(parent, category),
+                                bind_row=lambda card, index: self.bind_menu_card(card, category, index))
+        menu_list.pack(fill="x", pady=5)
+        menu_list.set_count(len(self.catalog.render_model[category]))
+        self.menu_lists[category] = menu_list
 
-            ttk.Label(info_frame, text=f"{name}", style="TLabel").pack(anchor="w")
+    #Building the widgets for one menu card, the item is filled in by bind_menu_card
+    def create_menu_card(self, parent, category):
+        card = ttk.Frame(parent, relief="ridge", borderwidth=2, padding=8, style="TFrame")
+        card.image_key = None
+        card.img_label = tk.Label(card, bg="lightblue")
+        card.img_label.pack(side="left")
 
-            if category == "Bowls":
-                ttk.Label(info_frame, text="Select Size:", style="TLabel").pack(anchor="w")
-                size_menu = ttk.OptionMenu(info_frame, self.selected_bowl_size, "Regular", *self.bowl_prices.keys())
-                size_menu.pack(anchor="w")
-            else:
-                price = self.prices[name]
-                ttk.Label(info_frame, text=f"Price: ${price:.2f}", style="TLabel").pack(anchor="w")
+        info_frame = ttk.Frame(card, style="TFrame")
+        info_frame.pack(side="left", padx=10, fill="x", expand=True)
 
-            # Move Add to Cart button to right side (its own vertical column)
-            button_frame = ttk.Frame(card, style="TFrame")
-            button_frame.pack(side="right", padx=5)
-            ttk.Button(button_frame, text="➕ Add to Cart", command=lambda n=name: self.show_add_ons(n) if category in ["Bowls", "Smoothies"] else self.quick_add_to_cart(n)).pack(ipadx=4, ipady=3)
+        card.name_label = ttk.Label(info_frame, style="TLabel")
+        card.name_label.pack(anchor="w")
 
-        self.create_footer(frame)
+        if category == "Bowls":
+            ttk.Label(info_frame, text="Select Size:", style="TLabel").pack(anchor="w")
+            size_menu = ttk.OptionMenu(info_frame, self.selected_bowl_size, "Regular", *self.bowl_prices.keys())
+            size_menu.pack(anchor="w")
+        else:
+            card.price_label = ttk.Label(info_frame, style="TLabel")
+            card.price_label.pack(anchor="w")
+
+        # Move Add to Cart button to right side (its own vertical column)
+        button_frame = ttk.Frame(card, style="TFrame")
+        button_frame.pack(side="right", padx=5)
+        card.add_button = ttk.Button(button_frame, text="➕ Add to Cart")
+        card.add_button.pack(ipadx=4, ipady=3)
+        return card
+
+    #Showing a menu item on a (possibly recycled) card
+    def bind_menu_card(self, card, category, index):
+        entry = self.catalog.render_model[category][index]
+        card.name_label.configure(text=entry.name)
+        if entry.price_text is not None:
+            card.price_label.configure(text=entry.price_text)
+        card.add_button.configure(command=lambda n=entry.name: self.show_add_ons(n) if entry.needs_add_ons else self.quick_add_to_cart(n))
+
+        alias = entry.image_key
+        card.image_key = alias
+        #Showing a blank placeholder until the image has been decoded
+        placeholder = self.image_manager.get_placeholder()
+        card.img_label.configure(image=placeholder)
+        card.img_label.image = placeholder
+        self.image_manager.request_image(alias, lambda image, c=card, key=alias: self.swap_image(c, key, image))
+
+    #Refresh hook for the cached menu pages, keeps the category and its images current
+    def enter_menu_page(self, category):
+        self.current_category = category
+        self.image_manager.set_active(["logo"] + [entry.image_key for entry in self.catalog.render_model[category]])
+        #Images evicted while the page was hidden were replaced by placeholders, binding the cards again brings them back
+        menu_list = self.menu_lists.get(category)
+        if menu_list is not None:
+            menu_list.refresh(force=True)
 
     #Function to hold the add-ons 
     def show_add_ons(self, item_name):
-        self.clear_frame()
         self.selected_item = item_name
         self.selected_addons = []
-        frame = ttk.Frame(self, padding=20, style="TFrame")
-        frame.pack(fill="both", expand=True)
+        frame = self.new_screen()
 
         self.display_logo(frame)
         ttk.Label(frame, text="Select Add-ons", font=("Segoe UI", 16, "bold"), style="TLabel").pack(pady=10)
@@ -225,7 +962,7 @@ class MamakaBowlsApp(tk.Tk):
         self.addon_vars = {}
         for addon in self.add_ons:
             var = tk.BooleanVar()
-            chk = tk.Checkbutton(frame, text=f"{addon} (+${self.prices[addon]:.2f})", variable=var, bg="lightblue")
+            chk = tk.Checkbutton(frame, text=self.catalog.addon_labels[addon], variable=var, bg="lightblue")
             chk.pack(anchor="w")
             self.addon_vars[addon] = var
 
@@ -237,77 +974,96 @@ class MamakaBowlsApp(tk.Tk):
         item = self.selected_item
         size = self.selected_bowl_size.get() if self.current_category == "Bowls" else "Regular"
         addons = [a for a, v in self.addon_vars.items() if v.get()]
-        key = f"{item} ({size}) ({', '.join(addons)})" if addons else f"{item} ({size})"
-        price = self.bowl_prices[size] if self.current_category == "Bowls" else self.prices[item]
-        total_price = price + sum(self.prices[a] for a in addons)
-
-        if key in self.cart:
-            self.cart[key]['quantity'] += 1
-        else:
-            self.cart[key] = {"price": total_price, "quantity": 1}
+        self.cart.add_item(item, size, addons)
 
         add_on_msg = f" with selected add-ons ({', '.join(addons)})" if addons else " with no add-ons"
-        messagebox.showinfo("Cart Updated", f"{item} ({size}){add_on_msg} has been added to your cart.")
-        self.create_home_page()
+        #Going back to the menu the item came from so the customer can keep ordering
+        self.show_menu_page(self.current_category)
+        self.toasts.show(f"{item} ({size}){add_on_msg} has been added to your cart.")
 
     #Function to add non-customizable items like coffee or tacos to cart
     def quick_add_to_cart(self, item_name):
         size = "Regular"
-        key = f"{item_name} ({size})"
-        price = self.prices[item_name]
-
         #add or update items in the cart
-        if key in self.cart:
-            self.cart[key]['quantity'] += 1
-        else:
-            self.cart[key] = {"price": price, "quantity": 1}
+        self.cart.add_item(item_name, size)
 
-        messagebox.showinfo("Cart Updated", f"{item_name} ({size}) has been added to your cart.")
-        self.create_home_page()
+        self.toasts.show(f"{item_name} ({size}) has been added to your cart.")
 
     #Display the cart contents and allow updates
     def view_cart_page(self):
-        self.clear_frame()
-        frame = ttk.Frame(self, padding=20, style="TFrame")
-        frame.pack(fill="both", expand=True)
+        frame = self.new_screen()
         self.display_logo(frame)
         ttk.Label(frame, text="🛒 Your Cart", font=("Segoe UI", 16, "bold")).pack(pady=10)
+        self.cart_view = None
         if not self.cart:
             ttk.Label(frame, text="Your cart is empty.").pack()
         else:
-            total = 0
-            for item, details in self.cart.items():
-                item_frame = ttk.Frame(frame)
-                item_frame.pack(fill="x", pady=5)
-                #Display item and quantity controls
-                ttk.Label(item_frame, text=item, style="TLabel", wraplength=250, justify="left").pack(side="left", padx=(0, 10))
-                ttk.Button(item_frame, text="-", width=2, command=lambda i=item: self.update_quantity(i, -1)).pack(side="left", padx=2)
-                ttk.Label(item_frame, text=str(details['quantity'])).pack(side="left")
-                ttk.Button(item_frame, text="+", width =2, command=lambda i=item: self.update_quantity(i, 1)).pack(side="left", padx=2)
-                item_total = details['price'] * details['quantity']
-                total += item_total
-                ttk.Label(item_frame, text=f"${item_total:.2f}", width=10, anchor="e").pack(side="right")
+            #Rows are only created for the visible lines and each keeps its own widgets, so a quantity change only touches that row
+            self.cart_view = frame
+            self.cart_keys = list(self.cart.lines)
+            self.cart_list = VirtualList(frame, row_height=44, create_row=self.create_cart_row, bind_row=self.bind_cart_row, max_visible_rows=6, gap=6)
+            self.cart_list.pack(fill="x")
+            self.cart_list.set_count(len(self.cart_keys))
             #Displaying total and special request box
-            ttk.Label(frame, text=f"Total: ${total:.2f}", font=self.custom_font).pack(pady=10)
+            self.cart_total_label = ttk.Label(frame, text=f"Total: {self.cart.subtotal()}", font=self.custom_font)
+            self.cart_total_label.pack(pady=10)
             self.special_request = tk.Text(frame, height=3, width=50, wrap="word")
             ttk.Label(frame, text="Special Requests:", style="TLabel").pack(anchor="w", pady=(10, 0))
             self.special_request.pack(pady=(0, 10))
             ttk.Button(frame, text="Proceed to Checkout", command=self.go_to_customer_info).pack(pady=10)
         self.create_footer(frame)
 
+    #Building the widgets for one cart row, the line is filled in by bind_cart_row
+    def create_cart_row(self, parent):
+        item_frame = ttk.Frame(parent)
+        #Display item and quantity controls
+        item_frame.name_label = ttk.Label(item_frame, style="TLabel", wraplength=250, justify="left")
+        item_frame.name_label.pack(side="left", padx=(0, 10))
+        item_frame.minus_button = ttk.Button(item_frame, text="-", width=2)
+        item_frame.minus_button.pack(side="left", padx=2)
+        item_frame.quantity_label = ttk.Label(item_frame)
+        item_frame.quantity_label.pack(side="left")
+        item_frame.plus_button = ttk.Button(item_frame, text="+", width =2)
+        item_frame.plus_button.pack(side="left", padx=2)
+        item_frame.total_label = ttk.Label(item_frame, width=10, anchor="e")
+        item_frame.total_label.pack(side="right")
+        return item_frame
+
+    #Showing a cart line on a (possibly recycled) row
+    def bind_cart_row(self, row, index):
+        item = self.cart_keys[index]
+        details = self.cart[item]
+        row.name_label.configure(text=self.catalog.describe(item))
+        row.minus_button.configure(command=lambda i=item: self.update_quantity(i, -1))
+        row.quantity_label.configure(text=str(details.quantity))
+        row.plus_button.configure(command=lambda i=item: self.update_quantity(i, 1))
+        row.total_label.configure(text=f"{details.total()}")
+
+    #Cart listener, updates only the affected row and the total while the cart screen is open
+    def on_cart_changed(self, event, key, line):
+        if self.cart_view is None or not self.cart_view.winfo_exists():
+            return
+        if not self.cart:
+            #Switching to the empty cart message
+            self.view_cart_page()
+            return
+        if event == "updated":
+            self.cart_list.update_row(self.cart_keys.index(key))
+        elif event in ("added", "removed"):
+            self.cart_keys = list(self.cart.lines)
+            self.cart_list.set_count(len(self.cart_keys))
+        self.cart_total_label.configure(text=f"Total: {self.cart.subtotal()}")
+
     #Function to adjust quantity of an item in cart
     def update_quantity(self, item, change):
-        if item in self.cart:
-            self.cart[item]['quantity'] += change
-            if self.cart[item]['quantity'] <= 0:
-                del self.cart[item]
-        self.view_cart_page()
+        self.cart.change_quantity(item, change)
 
     #Form to collect the customers information
     def go_to_customer_info(self):
-        self.clear_frame()
-        frame = ttk.Frame(self, padding=20, style="TFrame")
-        frame.pack(fill="both", expand=True)
+        #Keeping the special request before the cart screen is destroyed
+        if self.cart_view is not None and self.cart_view.winfo_exists():
+            self.cart.special_request = self.special_request.get("1.0", "end").strip()
+        frame = self.new_screen()
         self.display_logo(frame)
         ttk.Label(frame, text="Customer Info", font=("Segoe UI", 16, "bold"), style="TLabel").pack(pady=10)
 
@@ -352,9 +1108,7 @@ class MamakaBowlsApp(tk.Tk):
 
     #Payment info screen after the customer info screen
     def go_to_payment_info(self):
-        self.clear_frame()
-        frame = ttk.Frame(self, padding=20, style="TFrame")
-        frame.pack(fill="both", expand=True)
+        frame = self.new_screen()
         self.display_logo(frame)
         #Creating the input fields for payment info
         ttk.Label(frame, text="Payment Info", font=("Segoe UI", 16, "bold"), style="TLabel").pack(pady=10)
@@ -421,30 +1175,35 @@ class MamakaBowlsApp(tk.Tk):
             "cvv": self.card_cvv.get(),
             "exp": self.card_exp.get()
         }
-        self.clear_frame()
-        frame = ttk.Frame(self, padding=20)
-        frame.pack(fill="both", expand=True)
+        frame = self.new_screen()
         self.display_logo(frame)
         ttk.Label(frame, text="Checkout", font=("Segoe UI", 16, "bold")).pack(pady=10)
-        total = 0
-        #Show order summary and calculating totals
+        #Show order summary, the totals come from the cart
         for item, details in self.cart.items():
-            item_total = details['price'] * details['quantity']
-            total += item_total
-            ttk.Label(frame, text=f"{item} x{details['quantity']} - ${item_total:.2f}", style="TLabel", wraplength=400, justify="left").pack(anchor="w")
-        tax = total * 0.0825
-        grand_total = total + tax
-        ttk.Label(frame, text=f"Tax (8.25%): ${tax:.2f}").pack(anchor="w", pady=5)
-        ttk.Label(frame, text=f"Total: ${grand_total:.2f}", font=("Segoe UI", 12, "bold"), foreground="red").pack(anchor="w", pady=5)
-        self.order_id = random.randint(100000, 999999)
+            ttk.Label(frame, text=f"{self.catalog.describe(item)} x{details.quantity} - {details.total()}", style="TLabel", wraplength=400, justify="left").pack(anchor="w")
+        tax = self.cart.tax()
+        grand_total = self.cart.total()
+        ttk.Label(frame, text=f"Tax (8.25%): {tax}").pack(anchor="w", pady=5)
+        ttk.Label(frame, text=f"Total: {grand_total}", font=("Segoe UI", 12, "bold"), foreground="red").pack(anchor="w", pady=5)
         ttk.Button(frame, text="Confirm Order", command=self.place_order).pack(pady=10)
         self.create_footer(frame)
 
     # In place_order(), update the confirmation screen to show receipt and wait time
     def place_order(self):
-        self.clear_frame()
-        frame = ttk.Frame(self, padding=20, style="TFrame")
-        frame.pack(fill="both", expand=True)
+        #Too many orders are still being processed, the customer stays on the checkout page and confirms again shortly
+        if self.submitter.busy():
+            self.toasts.show("We're busy right now, please confirm again in a moment")
+            return
+        #The id is given out once the order is confirmed, viewing the checkout page again does not use one up
+        self.order_id = self.order_ids.next_id()
+        self.last_order = Order.from_cart(self.order_id, self.cart, self.customer_info)
+        #Saving and the receipt happen on the submitter's threads, the confirmation shows straight away
+        if not self.submitter.submit(self.last_order):
+            self.order_id = None
+            self.last_order = None
+            self.toasts.show("We're busy right now, please confirm again in a moment")
+            return
+        frame = self.new_screen()
         self.display_logo(frame)
 
         ttk.Label(frame, text="Order Confirmed!", font=("Segoe UI", 16, "bold"), foreground="red", style="TLabel").pack(pady=10)
@@ -465,9 +1224,9 @@ class MamakaBowlsApp(tk.Tk):
     
     #FAQ page
     def show_faq_page(self):
-        self.clear_frame()
-        frame = ttk.Frame(self, padding=20, style="TFrame")
-        frame.pack(fill="both", expand=True)
+        if self.raise_screen("faq"):
+            return
+        frame = self.new_screen("faq")
 
         self.display_logo(frame)
         ttk.Label(frame, text="Frequently Asked Questions", font=("Segoe UI", 16, "bold"), style="TLabel").pack(pady=10)
@@ -489,5 +1248,20 @@ class MamakaBowlsApp(tk.Tk):
 
 #Start of the application 
 if __name__ == '__main__':
+    mark_startup("imports done")
     app = MamakaBowlsApp()
+    mark_startup("home page built")
+    if "--timing" in sys.argv:
+        #Reporting once the home page has actually been drawn
+        app.after_idle(lambda: (mark_startup("home page shown"), print_startup_report()))
     app.mainloop()
+    app.image_manager.close()
+    app.catalog_loader.shutdown(wait=False)
+    #Orders still queued are finished before the journal and database are closed
+    app.submitter.close(timeout=app.JOURNAL_TIMEOUT)
+    app.kitchen.close()
+    app.journal.close()
+    if app.order_store is not None:
+        app.order_store.close()
+    if "--timing" in sys.argv:
+        app.screen_timer.print_report()
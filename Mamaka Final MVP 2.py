@@ -12,6 +12,7 @@ from PIL import Image, ImageTk
 import os  # Import the os module
 import random
 import re  # For phone number validation
+from MamakaOrderEngine import Catalog  # Shared price table so every version prices items the same way
 
 class ImageManager:
     def __init__(self, image_folder='images', size=(80, 80)):
@@ -67,49 +68,18 @@ class MamakaBowlsApp(tk.Tk):
         self.style.configure("Lightblue.TFrame", background="#e0f7fa")
 
         self.image_manager = ImageManager()
-        self.image_aliases = {
-            'larry bowl': 'larry',
-            'bean bowl': 'bean',
-            'bro bowl': 'bro',
-            'mamaka bowl': 'mamaka',
-            'mamaka': 'mamakasmo',
-            'larry': 'larrysmo',
-            'bean': 'beansmo',
-            'bro': 'brosmo',
-        }
+        self.catalog = Catalog.load()  # Menu and prices come from menu.json, shared with the other versions
+        # Item dicts for the menu screens, built from the catalog so the price shown is the price charged
         self.menu_items = {
-            "Bowls": [
-                {"name": "Mamaka Bowl", "sizes": {"Small": 9.50, "Regular": 11.00}},
-                {"name": "Larry Bowl", "sizes": {"Small": 9.50, "Regular": 11.00}},
-                {"name": "Bean Bowl", "sizes": {"Small": 9.50, "Regular": 11.00}},
-                {"name": "Bro Bowl", "sizes": {"Small": 9.50, "Regular": 11.00}},
-            ],
-            "Smoothies": [
-                {"name": "Mamaka", "price": 6.50},
-                {"name": "Larry", "price": 6.50},
-                {"name": "Bean", "price": 6.50},
-                {"name": "Bro", "price": 6.50},  # Flat rate for smoothies
-            ],
-            "Coffee": [
-                {"name": "Latte", "price": 4.75},
-                {"name": "Cappuccino", "price": 4.50},
-                {"name": "Americano", "price": 3.50},
-                {"name": "Matcha", "price": 5.00},
-            ],
-            "Tacos": [
-                {"name": "Breakfast Tacos", "price": 3.25}, # Only option for tacos
-            ],
-            "Add-ons": [
-                {"name": "Strawberry", "price": 0.50},
-                {"name": "Peanut Butter", "price": 0.50},
-                {"name": "Agave", "price": 0.50},
-                {"name": "Coconut Flakes", "price": 0.50},
-                {"name": "Chia Seeds", "price": 0.50},
-                {"name": "Bananas", "price": 0.50},
-            ]
+            category: [{"name": item, "sizes": dict(self.catalog.bowl_prices)} if self.catalog.has_sizes(item)
+                       else {"name": item, "price": self.catalog.prices[item]} for item in items]
+            for category, items in self.catalog.menu_items.items()
         }
-
+        self.menu_items["Add-ons"] = [{"name": addon, "price": self.catalog.prices[addon]} for addon in self.catalog.add_ons]
+        # Items that take add-ons, built once so checkout does a set lookup instead of scanning a list
+        self.add_on_items = {item for item in self.catalog.items if self.catalog.needs_add_ons(item)}
         self.cart = []
+        self.cart_index = {}  # Line key -> position in self.cart, so adding the same thing again bumps its quantity
         self.customer_info = {}
         self.payment_info = {}
         self.order_id = None
@@ -175,7 +145,7 @@ class MamakaBowlsApp(tk.Tk):
         back_button.pack(anchor="nw")
 
         if category == "Bowls":
-            prices_label = ttk.Label(menu_frame, text="Small: $9.50, Regular: $11.00", foreground="red", anchor="center", style="TLabel")
+            prices_label = ttk.Label(menu_frame, text=self.catalog.size_price_text, foreground="red", anchor="center", style="TLabel")
             prices_label.pack(pady="10")
 
         # Display menu items based on the category
@@ -183,17 +153,8 @@ class MamakaBowlsApp(tk.Tk):
             item_frame = ttk.Frame(menu_frame, style="Lightblue.TFrame")
             item_frame.pack(pady="10", fill="x")
 
-            item_key = item["name"].lower().strip()
-            item_key = self.image_aliases.get(item_key, item_key.replace(" ", ""))
-
-            if category == "Coffee" and item["name"].lower() == "matcha":
-                image = self.image_manager.get_image("matcha")
-            elif category == "Coffee":
-                image = self.image_manager.get_image("coffee")
-            elif category == "Tacos":
-                image = self.image_manager.get_image("taco")
-            else:
-                image = self.image_manager.get_image(item_key)
+            # Image names are resolved once when the catalog is built
+            image = self.image_manager.get_image(self.catalog.image_keys[item["name"]])
 
             if image:
                 img_label = tk.Label(item_frame, image=image, bg="#e0f7fa")
@@ -307,21 +268,24 @@ class MamakaBowlsApp(tk.Tk):
             if "checkbox_var" in addon and addon["checkbox_var"].get():
                 selected_addons.append(addon["name"])
 
-        #  Use size pricing if available, otherwise fall back to fixed item price
-        if "sizes" in selected_item:
-            price = selected_item["sizes"].get(size, selected_item["sizes"]["Regular"])
-        else:
-            price = selected_item["price"]
-
-        total_price = price + len(selected_addons) * 0.50
+        #  Price comes from the shared catalog price table, sizes only apply to items that have them
+        price_size = size if "sizes" in selected_item and size in selected_item["sizes"] else "Regular"
+        line_key = self.catalog.line_key(selected_item["name"], price_size, selected_addons)
+        total_price = self.catalog.price_cents(line_key) / 100
 
-        self.cart.append({
-            "name": selected_item["name"],
-            "size": size,
-            "price": total_price,
-            "addons": selected_addons,
-            "quantity": 1
-        })
+        # The catalog line key ignores add-on order, so identical additions land on the same line
+        position = self.cart_index.get(line_key)
+        if position is not None:
+            self.cart[position]["quantity"] += 1
+        else:
+            self.cart_index[line_key] = len(self.cart)
+            self.cart.append({
+                "name": selected_item["name"],
+                "size": size,
+                "price": total_price,
+                "addons": selected_addons,
+                "quantity": 1
+            })
         messagebox.showinfo("Added to Cart", f"{selected_item['name']} ({size}) with selected add-ons has been added to your cart.")
         self.create_home_page()
 
@@ -499,13 +463,13 @@ class MamakaBowlsApp(tk.Tk):
 
             name_label = ttk.Label(item_frame, text=f"{item['name']} ({item['size']}) x {item['quantity']}", width=30, anchor="w", style="TLabel")
             name_label.pack(side="left")
-            price_label = ttk.Label(item_frame, text=f"${item['price']:.2f}", width=10, anchor="e", style="TLabel")
+            price_label = ttk.Label(item_frame, text=f"${item['price'] * item['quantity']:.2f}", width=10, anchor="e", style="TLabel")
             price_label.pack(side="right")
-            if item['name'] in ["Mamaka Bowl", "Larry Bowl", "Bean Bowl", "Bro Bowl", "Mamaka", "Larry", "Bean", "Bro"]:
+            if item['name'] in self.add_on_items:
                 addons_label = ttk.Label(item_frame, text=f"Add-ons: {', '.join(item['addons']) if item['addons'] else 'None'}",
                                              width=40, anchor="w", style="TLabel")
                 addons_label.pack(side="left")
-            total_price += item["price"]
+            total_price += item["price"] * item["quantity"]
 
         tax_rate = 0.0825
         tax_amount = total_price * tax_rate
@@ -565,6 +529,7 @@ class MamakaBowlsApp(tk.Tk):
 
     # Clear session state for new order
         self.cart = []
+        self.cart_index = {}
         self.customer_info = {}
         self.payment_info = {}
         self.order_id = None
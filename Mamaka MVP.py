@@ -109,7 +109,10 @@ class MamakaBowlsApp(tk.Tk):
             ]
         }
 
+        # Items that take add-ons, built once so checkout does a set lookup instead of scanning a list
+        self.add_on_items = {item["name"] for category in ("Bowls", "Smoothies") for item in self.menu_items[category]}
         self.cart = []
+        self.cart_index = {}  # Line key -> position in self.cart, so adding the same thing again bumps its quantity
         self.customer_info = {}
         self.payment_info = {}
         self.order_id = None
@@ -314,13 +317,20 @@ class MamakaBowlsApp(tk.Tk):
 
         total_price = price + len(selected_addons) * 0.50
 
-        self.cart.append({
-            "name": selected_item["name"],
-            "size": size,
-            "price": total_price,
-            "addons": selected_addons,
-            "quantity": 1
-        })
+        # Identical additions (add-ons in any order) bump the quantity of the existing line
+        line_key = (selected_item["name"], size, frozenset(selected_addons))
+        position = self.cart_index.get(line_key)
+        if position is not None:
+            self.cart[position]["quantity"] += 1
+        else:
+            self.cart_index[line_key] = len(self.cart)
+            self.cart.append({
+                "name": selected_item["name"],
+                "size": size,
+                "price": total_price,
+                "addons": selected_addons,
+                "quantity": 1
+            })
         messagebox.showinfo("Added to Cart", f"{selected_item['name']} ({size}) with selected add-ons has been added to your cart.")
         self.create_home_page()  # Return to the home page after adding to cart
 
@@ -498,13 +508,13 @@ class MamakaBowlsApp(tk.Tk):
 
             name_label = ttk.Label(item_frame, text=f"{item['name']} ({item['size']}) x {item['quantity']}", width=30, anchor="w", style="TLabel")
             name_label.pack(side="left")
-            price_label = ttk.Label(item_frame, text=f"${item['price']:.2f}", width=10, anchor="e", style="TLabel")
+            price_label = ttk.Label(item_frame, text=f"${item['price'] * item['quantity']:.2f}", width=10, anchor="e", style="TLabel")
             price_label.pack(side="right")
-            if item['name'] in ["Mamaka Bowl", "Larry Bowl", "Bean Bowl", "Bro Bowl", "Mamaka", "Larry", "Bean", "Bro"]:
+            if item['name'] in self.add_on_items:
                 addons_label = ttk.Label(item_frame, text=f"Add-ons: {', '.join(item['addons']) if item['addons'] else 'None'}",
                                              width=40, anchor="w", style="TLabel")
                 addons_label.pack(side="left")
-            total_price += item["price"]
+            total_price += item["price"] * item["quantity"]
 
         tax_rate = 0.0825
         tax_amount = total_price * tax_rate
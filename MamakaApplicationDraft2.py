@@ -8,10 +8,11 @@ Purpose: A system that allows users to order food items from Mamaka Bowls and ca
 import tkinter as tk
 from tkinter import ttk, messagebox
 import datetime
-import random
 import re
+from MamakaOrderEngine import OrderIdGenerator
 
 TAX_RATE = 0.0825
+ORDER_IDS = OrderIdGenerator("D2")  # Time-ordered ids, a 4-digit random number repeats within a day
 
 class MamakaApp(tk.Tk):
     def __init__(self):
@@ -201,7 +202,7 @@ class CheckoutPage(tk.Frame):
 class ConfirmationPage(tk.Frame):
     def __init__(self, master):
         super().__init__(master, bg="#FAF3E0")
-        order_id = random.randint(1000, 9999)
+        order_id = ORDER_IDS.next_id()
         pickup_time = (datetime.datetime.now() + datetime.timedelta(minutes=15)).strftime("%I:%M %p")
 
         tk.Label(self, text="Order Confirmed!", font=("Helvetica", 20, "bold"), bg="#FAF3E0").pack(pady=10)
@@ -0,0 +1,291 @@
+"""
+Application:    Mamaka Bowls Ordering System - Kitchen Display
+Developer:      Code Runners
+Date:           4/22/2025
+Purpose:        A separate program for the kitchen screen that receives confirmed orders from the kiosks over a
+                local socket and shows the open tickets grouped by station. The kiosk side is KitchenLink, which
+                buffers tickets and reconnects on its own thread so the kiosk never waits for the kitchen.
+"""
+#Importing libraries
+import tkinter as tk
+from tkinter import ttk
+import json #tickets are sent as one JSON object per line
+import queue #handing received tickets to the Tk thread
+import socket #connection between the kiosks and the kitchen display
+import socketserver #the kitchen display's listening server
+import sys #command line options
+import threading #kiosk sender thread and server threads
+import time #ticket ages and reconnect delays
+from collections import deque, OrderedDict #bounded ticket buffer and the open tickets in arrival order
+
+#Where the kitchen display listens, kiosks on the same machine or network connect here
+KITCHEN_HOST = "127.0.0.1"
+KITCHEN_PORT = 8765
+
+#Kitchen ticket for an order, every line is tagged with the station (menu category) that makes it. The station
+#is the category recorded when the order was placed, the catalog is only asked for lines that have none
+def ticket_for(order, catalog=None):
+    return {
+        "order_id": order.order_id,
+        "placed_at": order.placed_at,
+        "name": f"{order.customer.get('first_name', '')} {order.customer.get('last_name', '')}".strip(),
+        "special_request": order.special_request,
+        "lines": [{"item": line.item, "size": line.size, "addons": list(line.addons), "quantity": line.quantity,
+                   "station": line.category or (catalog.category_of.get(line.item, "Other") if catalog else "Other")}
+                  for line in order.lines]
+    }
+
+#Reading host:port from a --kitchen=host:port option, falling back to the defaults
+def kitchen_address(argv=None):
+    for arg in (sys.argv if argv is None else argv):
+        if arg.startswith("--kitchen="):
+            host, _, port = arg.split("=", 1)[1].rpartition(":")
+            return host or KITCHEN_HOST, int(port)
+    return KITCHEN_HOST, KITCHEN_PORT
+
+#Kiosk side of the link. send() only adds the ticket to a bounded buffer, a sender thread keeps a connection
+#to the kitchen display open and writes new tickets in one go, and a reader thread takes the display's
+#acknowledgements. A ticket stays in the buffer until the display has acknowledged it, so when the connection
+#drops (the display was closed or restarted) the sender reconnects with a growing delay and sends every
+#unacknowledged ticket again, the display ignores ones it already has. If the display stays away long enough
+#for the buffer to fill, the oldest tickets are dropped and counted rather than letting the kiosk run out of memory
+class KitchenLink:
+    def __init__(self, address=(KITCHEN_HOST, KITCHEN_PORT), max_buffer=1000, retry_delay=0.5, max_retry_delay=5.0, timeout=5.0):
+        self.address = address
+        self.max_buffer = max_buffer
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.timeout = timeout
+        #Tickets the display has not acknowledged yet, and the ones of those not yet written on this connection
+        self.unacked = OrderedDict()
+        self.unsent = deque()
+        self.wakeup = threading.Condition()
+        self.connection = None
+        self.connected = False
+        self.dropped = 0
+        self.sent = 0
+        self.closed = False
+        self.sender = threading.Thread(target=self.send_loop, name="kitchen-link", daemon=True)
+        self.sender.start()
+
+    #Buffering a ticket for the kitchen, never waits for the network
+    def send(self, ticket):
+        line = (json.dumps(ticket, separators=(",", ":")) + "\n").encode("utf-8")
+        with self.wakeup:
+            if len(self.unacked) >= self.max_buffer:
+                self.unacked.popitem(last=False)
+                self.dropped += 1
+            self.unacked[ticket["order_id"]] = line
+            self.unsent.append(ticket["order_id"])
+            self.wakeup.notify()
+
+    #Sender thread, a fresh connection starts by sending every ticket that has not been acknowledged
+    def send_loop(self):
+        delay = self.retry_delay
+        while True:
+            with self.wakeup:
+                while not self.unsent and not self.closed:
+                    self.wakeup.wait()
+                if self.closed and not self.unsent:
+                    break
+                connection = self.connection
+                if connection is None:
+                    order_ids = list(self.unacked)
+                else:
+                    order_ids = [order_id for order_id in self.unsent if order_id in self.unacked]
+                self.unsent.clear()
+                lines = [self.unacked[order_id] for order_id in order_ids]
+            try:
+                if connection is None:
+                    connection = socket.create_connection(self.address, timeout=self.timeout)
+                    with self.wakeup:
+                        self.connection = connection
+                        self.connected = True
+                    threading.Thread(target=self.read_acks, args=(connection,), name="kitchen-acks", daemon=True).start()
+                    delay = self.retry_delay
+                connection.sendall(b"".join(lines))
+                self.sent += len(lines)
+            except OSError:
+                self.drop_connection(connection)
+                if self.closed:
+                    break
+                time.sleep(delay)
+                delay = min(delay * 2, self.max_retry_delay)
+        self.drop_connection(self.connection)
+
+    #Reader thread for one connection, each line from the display is the id of a ticket it has received
+    def read_acks(self, connection):
+        data = b""
+        while True:
+            try:
+                chunk = connection.recv(4096)
+            except socket.timeout:
+                if self.connection is not connection:
+                    return
+                continue
+            except OSError:
+                chunk = b""
+            if not chunk:
+                self.drop_connection(connection)
+                return
+            data += chunk
+            *lines, data = data.split(b"\n")
+            with self.wakeup:
+                for line in lines:
+                    try:
+                        self.unacked.pop(json.loads(line), None)
+                    except (ValueError, TypeError):
+                        continue
+
+    #Forgetting a broken connection, everything not acknowledged is queued to be sent again on the next one
+    def drop_connection(self, connection):
+        with self.wakeup:
+            if connection is None:
+                #Connecting failed, the tickets taken for this attempt wait for the next one
+                self.unsent = deque(self.unacked)
+                return
+            if self.connection is connection:
+                self.connection = None
+                self.connected = False
+                self.unsent = deque(self.unacked)
+                self.wakeup.notify()
+        try:
+            connection.close()
+        except OSError:
+            pass
+
+    #Stopping the sender after it has tried to send what is still buffered
+    def close(self, timeout=2):
+        with self.wakeup:
+            self.closed = True
+            self.wakeup.notify()
+        self.sender.join(timeout)
+
+#Kitchen side of the link, every connected kiosk gets its own thread that reads one ticket per line
+class TicketServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, tickets):
+        self.tickets = tickets
+        super().__init__(address, TicketHandler)
+
+class TicketHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                ticket = json.loads(line)
+            except ValueError:
+                continue
+            self.server.tickets.put(ticket)
+            #Acknowledging the ticket, the kiosk keeps sending it again after every reconnect until it sees this
+            try:
+                self.wfile.write((json.dumps(ticket.get("order_id")) + "\n").encode("utf-8"))
+            except OSError:
+                return
+
+#Kitchen display window, one column per station with the open tickets oldest first
+class KitchenDisplayApp(tk.Tk):
+    #How often received tickets are collected and ticket ages updated
+    POLL_MS = 200
+    #Tickets shown per station, the rest are counted under the column
+    MAX_VISIBLE = 12
+
+    def __init__(self, stations, address=(KITCHEN_HOST, KITCHEN_PORT)):
+        super().__init__()
+        self.title("Mamaka Bowls Kitchen")
+        self.geometry("1100x700")
+        self.configure(bg="lightblue")
+        self.style = ttk.Style(self)
+        self.style.theme_use("default")
+        self.style.configure("TLabel", font=("Segoe UI", 11), background="lightblue")
+        self.style.configure("TFrame", background="lightblue")
+        self.style.configure("Ticket.TFrame", background="white")
+        self.style.configure("Ticket.TLabel", font=("Segoe UI", 11), background="white")
+
+        self.stations = list(stations)
+        #Open tickets per station, keyed by order id so a ticket resent after a reconnect is only shown once
+        self.open_tickets = {station: OrderedDict() for station in self.stations}
+        self.seen = set()
+        self.received = queue.Queue()
+        self.server = TicketServer(address, self.received)
+        threading.Thread(target=self.server.serve_forever, name="kitchen-server", daemon=True).start()
+
+        self.status = ttk.Label(self, text=f"Listening on {address[0]}:{address[1]}", style="TLabel")
+        self.status.pack(anchor="w", padx=10, pady=(10, 0))
+        board = ttk.Frame(self, padding=10, style="TFrame")
+        board.pack(fill="both", expand=True)
+        self.columns = {}
+        self.more_labels = {}
+        for column, station in enumerate(self.stations):
+            board.grid_columnconfigure(column, weight=1, uniform="station")
+            ttk.Label(board, text=station, font=("Segoe UI", 16, "bold"), style="TLabel").grid(row=0, column=column, pady=(0, 10))
+            self.columns[station] = ttk.Frame(board, style="TFrame")
+            self.columns[station].grid(row=1, column=column, sticky="nsew", padx=5)
+            self.more_labels[station] = ttk.Label(board, style="TLabel")
+            self.more_labels[station].grid(row=2, column=column)
+        self.protocol("WM_DELETE_WINDOW", self.close)
+        self.after(self.POLL_MS, self.poll)
+
+    #Taking every ticket that arrived since the last poll and redrawing only the stations they touch
+    def poll(self):
+        changed = set()
+        while True:
+            try:
+                ticket = self.received.get_nowait()
+            except queue.Empty:
+                break
+            if ticket.get("order_id") in self.seen:
+                continue
+            self.seen.add(ticket.get("order_id"))
+            for line in ticket.get("lines", []):
+                station = line.get("station") if line.get("station") in self.open_tickets else self.stations[-1]
+                entry = self.open_tickets[station].setdefault(ticket["order_id"], {"ticket": ticket, "lines": []})
+                entry["lines"].append(line)
+                changed.add(station)
+        for station in changed:
+            self.draw_station(station)
+        waiting = sum(len(tickets) for tickets in self.open_tickets.values())
+        self.status.configure(text=f"{waiting} open tickets")
+        self.after(self.POLL_MS, self.poll)
+
+    def draw_station(self, station):
+        column = self.columns[station]
+        for widget in column.winfo_children():
+            widget.destroy()
+        tickets = self.open_tickets[station]
+        for order_id, entry in list(tickets.items())[:self.MAX_VISIBLE]:
+            self.create_ticket(column, station, order_id, entry)
+        hidden = len(tickets) - self.MAX_VISIBLE
+        self.more_labels[station].configure(text=f"+{hidden} more" if hidden > 0 else "")
+
+    #One ticket card with the items for this station and a button to clear it when it is ready
+    def create_ticket(self, parent, station, order_id, entry):
+        ticket = entry["ticket"]
+        card = ttk.Frame(parent, relief="ridge", borderwidth=2, padding=6, style="Ticket.TFrame")
+        card.pack(fill="x", pady=4)
+        placed = time.strftime("%I:%M %p", time.localtime(ticket.get("placed_at", time.time())))
+        heading = f"#{order_id}  {ticket.get('name', '')}".strip()
+        ttk.Label(card, text=f"{heading}  ({placed})", font=("Segoe UI", 11, "bold"), style="Ticket.TLabel").pack(anchor="w")
+        for line in entry["lines"]:
+            addons = f" + {', '.join(line['addons'])}" if line.get("addons") else ""
+            size = f" ({line['size']})" if line.get("size") and line["size"] != "Regular" else ""
+            ttk.Label(card, text=f"{line['quantity']} x {line['item']}{size}{addons}", wraplength=230, style="Ticket.TLabel").pack(anchor="w")
+        if ticket.get("special_request"):
+            ttk.Label(card, text=f"Note: {ticket['special_request']}", foreground="red", wraplength=230, style="Ticket.TLabel").pack(anchor="w")
+        ttk.Button(card, text="Done", command=lambda: self.finish_ticket(station, order_id)).pack(anchor="e")
+
+    def finish_ticket(self, station, order_id):
+        self.open_tickets[station].pop(order_id, None)
+        self.draw_station(station)
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.destroy()
+
+#Start of the kitchen display, the stations are the menu categories
+if __name__ == '__main__':
+    from MamakaOrderEngine import Catalog
+    app = KitchenDisplayApp(list(Catalog.load().menu_items) + ["Other"], kitchen_address())
+    app.mainloop()
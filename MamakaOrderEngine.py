@@ -0,0 +1,670 @@
+"""
+Application:    Mamaka Bowls Ordering System - Order Engine
+Developer:      Code Runners
+Date:           4/22/2025
+Purpose:        The menu, pricing, cart and order logic of the ordering system with no user interface,
+                so it can be used by the Tk app, other front ends and benchmarks.
+"""
+#Importing libraries
+import os #locating the menu file and replacing the compiled cache
+import json #reading the menu file
+import pickle #saving the compiled catalog
+import hashlib #hashing the menu file to know when the compiled catalog is stale
+import math #checking menu prices are real numbers
+import random #random orders for the benchmark
+import socket #the machine's name is the default kiosk prefix
+import sys #command line options
+import time #timestamps for placed orders and benchmark timing
+import threading #order ids are handed out to several threads
+from collections import namedtuple #compact hashable cart line keys
+from array import array #flat price table
+from types import MappingProxyType #read-only views of the catalog's lookups
+
+#Sales tax of 8.25% in basis points, tax is rounded half up to the nearest cent on the order subtotal
+TAX_BASIS_POINTS = 825
+
+#The menu the app ships with, kept next to this file so prices can change without editing Python
+MENU_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "menu.json")
+#Bumped whenever the compiled catalog changes shape so old cache files are rebuilt
+CATALOG_CACHE_VERSION = 5
+
+#Converting a price in dollars to whole cents
+def to_cents(price):
+    return int(round(price * 100))
+
+#An amount of money kept as whole cents so totals add up exactly
+class Money:
+    __slots__ = ("cents",)
+
+    def __init__(self, cents=0):
+        self.cents = int(cents)
+
+    @classmethod
+    def from_dollars(cls, dollars):
+        return cls(to_cents(dollars))
+
+    #Percentage given in basis points (825 = 8.25%), rounded half up to the nearest cent
+    def percent(self, basis_points):
+        product = self.cents * basis_points
+        sign = -1 if product < 0 else 1
+        return Money(sign * ((abs(product) + 5000) // 10000))
+
+    def dollars(self):
+        return self.cents / 100
+
+    def __add__(self, other):
+        return Money(self.cents + other.cents)
+
+    def __sub__(self, other):
+        return Money(self.cents - other.cents)
+
+    def __mul__(self, quantity):
+        return Money(self.cents * quantity)
+
+    __rmul__ = __mul__
+
+    def __eq__(self, other):
+        return isinstance(other, Money) and self.cents == other.cents
+
+    def __lt__(self, other):
+        return self.cents < other.cents
+
+    def __hash__(self):
+        return hash(self.cents)
+
+    def __bool__(self):
+        return self.cents != 0
+
+    #Formatting as dollars straight from the integer so no float rounding is involved
+    def __str__(self):
+        sign = "-" if self.cents < 0 else ""
+        return f"{sign}${abs(self.cents) // 100}.{abs(self.cents) % 100:02d}"
+
+    def __repr__(self):
+        return f"Money({self.cents})"
+
+#Identifies a cart line by item, size and the set of add-ons (one bit per add-on), so add-on order does not matter
+LineKey = namedtuple("LineKey", ["item_id", "size_id", "addon_mask"])
+
+#Everything a menu card shows, worked out once per catalog so drawing a card does no string work
+MenuCard = namedtuple("MenuCard", ["name", "image_key", "price_text", "needs_add_ons"])
+
+#Menu data and the lookups that the screens and the pricing need. A catalog is a snapshot: it is never
+#changed after it is built, a price change loads a new catalog so carts pinned to the old one keep their prices
+class Catalog:
+    #Categories whose items can be customised with add-ons
+    ADD_ON_CATEGORIES = ("Bowls", "Smoothies")
+    #Categories whose price depends on the chosen size
+    SIZED_CATEGORIES = ("Bowls",)
+    #Add-on sums are kept for every combination, so the number of add-ons is limited to keep that table small
+    MAX_ADD_ONS = 16
+    #Highest price in dollars a menu file may set, anything above is taken to be a typo
+    MAX_PRICE = 1000
+
+    def __init__(self, menu_items, prices, bowl_prices, add_ons, image_aliases, version=None):
+        self.version = version
+        self.menu_items = {category: tuple(items) for category, items in menu_items.items()}
+        self.prices = dict(prices)
+        self.bowl_prices = dict(bowl_prices)
+        self.add_ons = tuple(add_ons)
+        self.image_aliases = dict(image_aliases)
+        self.category_of = {item: category for category, items in menu_items.items() for item in items}
+        #Numbering items, sizes and add-ons so cart lines can be keyed by small integers
+        self.items = list(self.category_of)
+        self.item_ids = {item: item_id for item_id, item in enumerate(self.items)}
+        self.sizes = list(bowl_prices) + ([] if "Regular" in bowl_prices else ["Regular"])
+        self.size_ids = {size: size_id for size_id, size in enumerate(self.sizes)}
+        self.addon_bits = {addon: 1 << bit for bit, addon in enumerate(add_ons)}
+        self.compile_prices()
+        self.build_render_model()
+        self.freeze()
+
+    #Turning every lookup into a read-only view or a tuple and refusing changes from here on. The price
+    #tables stay flat arrays of integers behind a read-only memoryview rather than tuples of boxed ints
+    def freeze(self):
+        for name, value in list(self.__dict__.items()):
+            if isinstance(value, dict):
+                object.__setattr__(self, name, MappingProxyType(value))
+            elif isinstance(value, array):
+                object.__setattr__(self, name, memoryview(value).toreadonly())
+            elif isinstance(value, list):
+                object.__setattr__(self, name, tuple(value))
+        object.__setattr__(self, "frozen", True)
+
+    #Read-only views can not be pickled, so the compiled cache stores plain dicts and arrays and freezes them again on load
+    def __getstate__(self):
+        state = {}
+        for name, value in self.__dict__.items():
+            if isinstance(value, MappingProxyType):
+                value = dict(value)
+            elif isinstance(value, memoryview):
+                value = array(value.format, value.tobytes())
+            state[name] = value
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.freeze()
+
+    #Refusing changes once built, so a snapshot shared by open carts can not drift
+    def __setattr__(self, name, value):
+        if self.__dict__.get("frozen"):
+            raise AttributeError(f"catalog {self.version} can not be changed, load a new catalog instead")
+        object.__setattr__(self, name, value)
+
+    #Building the base price of every item and size and the add-on total of every add-on combination once,
+    #so pricing a line is two indexes and the tables grow with items plus combinations, not items times combinations
+    def compile_prices(self):
+        self.mask_count = 1 << len(self.add_ons)
+        #Summing add-on prices for every bitmask, each mask reuses the sum for the mask without its lowest bit
+        addon_cents = [to_cents(self.prices[addon]) for addon in self.add_ons]
+        self.mask_cents = array('q', bytes(8 * self.mask_count))
+        for mask in range(1, self.mask_count):
+            lowest = mask & -mask
+            self.mask_cents[mask] = self.mask_cents[mask ^ lowest] + addon_cents[lowest.bit_length() - 1]
+        self.base_cents = array('q')
+        for item in self.items:
+            for size in self.sizes:
+                if self.has_sizes(item):
+                    #-1 marks a size the item is not sold in
+                    self.base_cents.append(to_cents(self.bowl_prices[size]) if size in self.bowl_prices else -1)
+                else:
+                    self.base_cents.append(to_cents(self.prices[item]))
+
+    #Resolving image names and price labels for every menu card once, a new catalog builds a new model
+    def build_render_model(self):
+        self.image_keys = {item: self.image_aliases.get(item.lower(), item.lower().replace(" ", "")) for item in self.items}
+        self.render_model = {}
+        for category, items in self.menu_items.items():
+            sized = category in self.SIZED_CATEGORIES
+            self.render_model[category] = tuple(
+                MenuCard(item, self.image_keys[item], None if sized else f"Price: {Money.from_dollars(self.prices[item])}",
+                         category in self.ADD_ON_CATEGORIES)
+                for item in items)
+        self.size_price_text = "   ".join(f"{size}: {Money.from_dollars(price)}" for size, price in self.bowl_prices.items())
+        self.addon_labels = {addon: f"{addon} (+{Money.from_dollars(self.prices[addon])})" for addon in self.add_ons}
+
+    #Price in cents of one item for a line key
+    def price_cents(self, key):
+        base = self.base_cents[key.item_id * len(self.sizes) + key.size_id]
+        if base < 0:
+            raise KeyError(f"{self.items[key.item_id]} is not sold in size {self.sizes[key.size_id]}")
+        return base + self.mask_cents[key.addon_mask]
+
+    #Catalog built from a menu file, the compiled catalog is cached beside it keyed by the file's hash
+    #so startup skips parsing and checking the menu when it has not changed
+    @classmethod
+    def load(cls, path=MENU_FILE, cache_path=None):
+        cache_path = cache_path or path + ".compiled"
+        with open(path, "rb") as menu_file:
+            source = menu_file.read()
+        digest = hashlib.sha256(source).hexdigest()
+        try:
+            with open(cache_path, "rb") as cache_file:
+                version, cached_digest, catalog = pickle.load(cache_file)
+            if version == CATALOG_CACHE_VERSION and cached_digest == digest:
+                return catalog
+        except (OSError, EOFError, ValueError, TypeError, AttributeError, ImportError, pickle.UnpicklingError):
+            pass
+        try:
+            menu = json.loads(source)
+        except ValueError as error:
+            raise ValueError(f"{path} is not valid JSON: {error}") from None
+        catalog = cls(**cls.validate(menu, path), version=digest[:12])
+        #Writing to a temporary file first so a crash never leaves half a cache behind
+        temp_path = cache_path + ".tmp"
+        try:
+            with open(temp_path, "wb") as cache_file:
+                pickle.dump((CATALOG_CACHE_VERSION, digest, catalog), cache_file, pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_path)
+        except OSError:
+            pass
+        return catalog
+
+    #Checking a menu read from a file, raises ValueError naming the first problem found
+    @classmethod
+    def validate(cls, menu, source="menu"):
+        fields = ("menu_items", "prices", "bowl_prices", "add_ons", "image_aliases")
+        if not isinstance(menu, dict):
+            raise ValueError(f"{source}: the menu must be an object with {', '.join(fields)}")
+        missing = [field for field in fields if field not in menu]
+        if missing:
+            raise ValueError(f"{source}: missing {', '.join(missing)}")
+        menu_items, prices, bowl_prices = menu["menu_items"], menu["prices"], menu["bowl_prices"]
+        add_ons, image_aliases = menu["add_ons"], menu["image_aliases"]
+        if not isinstance(menu_items, dict) or not all(isinstance(items, list) for items in menu_items.values()):
+            raise ValueError(f"{source}: menu_items must map each category to a list of item names")
+        for category, items in menu_items.items():
+            if not cls.is_name(category):
+                raise ValueError(f"{source}: menu_items has a category named {category!r}, names must be text")
+            for item in items:
+                if not cls.is_name(item):
+                    raise ValueError(f"{source}: menu_items[{category!r}] lists {item!r}, item names must be text")
+        if not isinstance(add_ons, list):
+            raise ValueError(f"{source}: add_ons must be a list of different names")
+        for addon in add_ons:
+            if not cls.is_name(addon):
+                raise ValueError(f"{source}: add_ons lists {addon!r}, add-on names must be text")
+        if len(set(add_ons)) != len(add_ons):
+            raise ValueError(f"{source}: add_ons must be a list of different names")
+        if len(add_ons) > cls.MAX_ADD_ONS:
+            raise ValueError(f"{source}: at most {cls.MAX_ADD_ONS} add-ons are supported, not {len(add_ons)}")
+        if not isinstance(image_aliases, dict):
+            raise ValueError(f"{source}: image_aliases must map item names to image names")
+        for name, image in image_aliases.items():
+            if not cls.is_name(name) or not cls.is_name(image):
+                raise ValueError(f"{source}: image_aliases[{name!r}] must be an image name, not {image!r}")
+        for label, table in (("prices", prices), ("bowl_prices", bowl_prices)):
+            if not isinstance(table, dict):
+                raise ValueError(f"{source}: {label} must map names to prices")
+            for name, price in table.items():
+                if not cls.is_name(name):
+                    raise ValueError(f"{source}: {label} has a price for {name!r}, names must be text")
+                if (isinstance(price, bool) or not isinstance(price, (int, float)) or not math.isfinite(price)
+                        or not 0 <= price <= cls.MAX_PRICE):
+                    raise ValueError(f"{source}: {label}[{name!r}] must be a price from 0 to {cls.MAX_PRICE}, not {price!r}")
+        seen = set()
+        for category, items in menu_items.items():
+            for item in items:
+                if item in seen:
+                    raise ValueError(f"{source}: {item!r} is listed in more than one category")
+                seen.add(item)
+                if category not in cls.SIZED_CATEGORIES and item not in prices:
+                    raise ValueError(f"{source}: {item!r} in {category} has no price")
+        #The screens and the cart start every item on the Regular size
+        if any(category in cls.SIZED_CATEGORIES for category in menu_items) and "Regular" not in bowl_prices:
+            raise ValueError(f"{source}: bowl_prices needs a Regular size")
+        for addon in add_ons:
+            if addon not in prices:
+                raise ValueError(f"{source}: add-on {addon!r} has no price")
+        return {field: menu[field] for field in fields}
+
+    #Names in a menu file are non-empty text
+    @staticmethod
+    def is_name(value):
+        return isinstance(value, str) and value.strip() != ""
+
+    def needs_add_ons(self, item):
+        return self.category_of[item] in self.ADD_ON_CATEGORIES
+
+    def has_sizes(self, item):
+        return self.category_of[item] in self.SIZED_CATEGORIES
+
+    def sizes_for(self, item):
+        return list(self.bowl_prices) if self.has_sizes(item) else ["Regular"]
+
+    #Bitmask with one bit set per selected add-on
+    def addon_mask(self, addons):
+        mask = 0
+        for addon in addons:
+            mask |= self.addon_bits[addon]
+        return mask
+
+    #Selected add-ons in menu order
+    def addons_from_mask(self, mask):
+        return [addon for addon, bit in self.addon_bits.items() if mask & bit]
+
+    def line_key(self, item, size="Regular", addons=()):
+        return LineKey(self.item_ids[item], self.size_ids[size], self.addon_mask(addons))
+
+    #Turning a line key back into item name, size and add-ons
+    def line_parts(self, key):
+        return self.items[key.item_id], self.sizes[key.size_id], self.addons_from_mask(key.addon_mask)
+
+    #Text shown for a cart line, only built when a screen needs it
+    def describe(self, key):
+        item, size, addons = self.line_parts(key)
+        return f"{item} ({size}) ({', '.join(addons)})" if addons else f"{item} ({size})"
+
+    #Name of the image file shown for an item
+    def image_key(self, item):
+        return self.image_keys[item]
+
+#Holds the catalog that new sessions start with and swaps in a new snapshot when the menu file changes.
+#reload() reads and compiles the file so it can run on a worker thread, swap() is one assignment
+class CatalogStore:
+    def __init__(self, path=MENU_FILE):
+        self.path = path
+        self.modified = self.file_modified()
+        self.current = Catalog.load(path)
+
+    def file_modified(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    #Loading the menu again if the file changed (or when forced), returns the new catalog or None if nothing changed
+    def reload(self, force=False):
+        modified = self.file_modified()
+        if not force and modified == self.modified:
+            return None
+        #Remembered before loading, so a broken file is reported once and not retried until it changes again
+        self.modified = modified
+        catalog = Catalog.load(self.path)
+        if catalog.version == self.current.version:
+            return None
+        return catalog
+
+    #Making a catalog the one new sessions use, returns the one it replaced
+    def swap(self, catalog):
+        previous, self.current = self.current, catalog
+        return previous
+
+#Works out item prices and tax from a catalog
+class Pricer:
+    def __init__(self, catalog, tax_basis_points=TAX_BASIS_POINTS):
+        self.catalog = catalog
+        self.tax_basis_points = tax_basis_points
+
+    #Price of one item with its size and add-ons, looked up in the catalog's price table
+    def unit_price(self, item, size="Regular", addons=()):
+        return self.line_price(self.catalog.line_key(item, size, addons))
+
+    def line_price(self, key):
+        return Money(self.catalog.price_cents(key))
+
+    #Tax on a subtotal, the one place tax is rounded
+    def tax(self, subtotal):
+        return subtotal.percent(self.tax_basis_points)
+
+#One line in a cart, __slots__ keeps each line small when many carts are open
+class CartLine:
+    __slots__ = ("price_cents", "quantity")
+
+    def __init__(self, price_cents, quantity=1):
+        self.price_cents = price_cents
+        self.quantity = quantity
+
+    #Price of one item on this line
+    @property
+    def price(self):
+        return Money(self.price_cents)
+
+    #Price of the whole line
+    def total(self):
+        return Money(self.price_cents * self.quantity)
+
+#Cart contents that tells its listeners which line changed so screens can update just that line
+class Cart:
+    def __init__(self, pricer):
+        self.pricer = pricer
+        self.lines = {}
+        self.listeners = []
+        self.special_request = ""
+        #Running totals kept up to date on every change so reading them does not walk the cart
+        self.subtotal_cents = 0
+        self.item_count = 0
+
+    #Registering a function called as listener(event, key, line) after every change
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+
+    def notify(self, event, key=None, line=None):
+        for listener in list(self.listeners):
+            listener(event, key, line)
+
+    #Adding a menu item, the price comes from the pricer and the line is keyed by a LineKey
+    def add_item(self, item, size="Regular", addons=(), quantity=1):
+        catalog = self.pricer.catalog
+        if not catalog.has_sizes(item):
+            size = "Regular"
+        key = catalog.line_key(item, size, addons)
+        self.add(key, self.pricer.line_price(key), quantity)
+        return key
+
+    #Adding a line or bumping its quantity if the same line is already in the cart
+    def add(self, key, price, quantity=1):
+        self.subtotal_cents += price.cents * quantity
+        self.item_count += quantity
+        line = self.lines.get(key)
+        if line is not None:
+            line.quantity += quantity
+            self.notify("updated", key, line)
+        else:
+            line = self.lines[key] = CartLine(price.cents, quantity)
+            self.notify("added", key, line)
+
+    #Changing a line's quantity, the line is removed once it reaches zero
+    def change_quantity(self, key, change):
+        line = self.lines.get(key)
+        if line is None:
+            return
+        #Quantities never go below zero, so a removed line only takes off what it had
+        change = max(change, -line.quantity)
+        line.quantity += change
+        self.subtotal_cents += line.price_cents * change
+        self.item_count += change
+        if line.quantity <= 0:
+            del self.lines[key]
+            self.notify("removed", key, line)
+        else:
+            self.notify("updated", key, line)
+
+    def clear(self):
+        self.lines.clear()
+        self.special_request = ""
+        self.subtotal_cents = 0
+        self.item_count = 0
+        self.notify("cleared")
+
+    def subtotal(self):
+        return Money(self.subtotal_cents)
+
+    def tax(self):
+        return self.pricer.tax(self.subtotal())
+
+    def total(self):
+        return self.subtotal() + self.tax()
+
+    #Number of items across all lines
+    def count(self):
+        return self.item_count
+
+    def items(self):
+        return self.lines.items()
+
+    def __contains__(self, key):
+        return key in self.lines
+
+    def __getitem__(self, key):
+        return self.lines[key]
+
+    def __len__(self):
+        return len(self.lines)
+
+#One line of a placed order with the item, size and add-ons spelled out. The category is taken from the
+#catalog the order was placed with, so the kitchen station stays right even after the menu changes
+class OrderLine:
+    __slots__ = ("item", "size", "addons", "price_cents", "quantity", "category")
+
+    def __init__(self, item, size, addons, price_cents, quantity, category=None):
+        self.item = item
+        self.size = size
+        self.addons = addons
+        self.price_cents = price_cents
+        self.quantity = quantity
+        self.category = category
+
+    @property
+    def price(self):
+        return Money(self.price_cents)
+
+    def total(self):
+        return Money(self.price_cents * self.quantity)
+
+    def to_dict(self):
+        return {"item": self.item, "size": self.size, "addons": list(self.addons), "price": self.price_cents, "quantity": self.quantity,
+                "category": self.category}
+
+    #Lines journaled before categories were recorded have none
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["item"], data["size"], tuple(data["addons"]), data["price"], data["quantity"], data.get("category"))
+
+#A placed order, copied from the cart so clearing the cart afterwards does not change it
+class Order:
+    __slots__ = ("order_id", "lines", "customer", "subtotal", "tax", "total", "special_request", "placed_at")
+
+    def __init__(self, order_id, lines, customer, subtotal, tax, total, special_request="", placed_at=None):
+        self.order_id = order_id
+        self.lines = lines
+        self.customer = customer
+        self.subtotal = subtotal
+        self.tax = tax
+        self.total = total
+        self.special_request = special_request
+        self.placed_at = placed_at if placed_at is not None else time.time()
+
+    @classmethod
+    def from_cart(cls, order_id, cart, customer=None):
+        catalog = cart.pricer.catalog
+        lines = []
+        for key, line in cart.items():
+            item, size, addons = catalog.line_parts(key)
+            lines.append(OrderLine(item, size, tuple(addons), line.price_cents, line.quantity, catalog.category_of[item]))
+        subtotal = cart.subtotal()
+        tax = cart.pricer.tax(subtotal)
+        return cls(order_id, lines, dict(customer or {}), subtotal, tax, subtotal + tax, cart.special_request)
+
+    #Plain data for saving, money is written as whole cents
+    def to_dict(self):
+        return {
+            "order_id": self.order_id,
+            "lines": [line.to_dict() for line in self.lines],
+            "customer": self.customer,
+            "subtotal": self.subtotal.cents,
+            "tax": self.tax.cents,
+            "total": self.total.cents,
+            "special_request": self.special_request,
+            "placed_at": self.placed_at
+        }
+
+    #Rebuilding an order saved by to_dict
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["order_id"], [OrderLine.from_dict(line) for line in data["lines"]], data["customer"],
+                   Money(data["subtotal"]), Money(data["tax"]), Money(data["total"]), data["special_request"], data["placed_at"])
+
+#Crockford base32 leaves out I, L, O and U so order ids can be read out loud without mix-ups
+ORDER_ID_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+#Order ids count seconds from the start of 2025, six characters last until 2059
+ORDER_ID_EPOCH = 1735689600
+ORDER_ID_DIGITS = 6
+
+#Hands out short, unique, time-ordered order ids such as "K1-1NYRHT". The number is the second the order
+#was placed, or one more than the last id handed out when that is later (several orders in one second, or a
+#clock that went back), so ids never repeat and sort by when the order was placed. A lock keeps threads
+#sharing a generator from taking the same number, and each kiosk has its own prefix so kiosks never coordinate
+class OrderIdGenerator:
+    def __init__(self, prefix="K1", last_id=None, clock=time.time):
+        self.prefix = prefix
+        self.clock = clock
+        self.last = self.decode(last_id) if last_id is not None else -1
+        self.lock = threading.Lock()
+
+    #Generator continuing after the newest id this kiosk has already used, e.g. ids replayed from the journal,
+    #ids that were not made by encode are skipped
+    @classmethod
+    def resume(cls, prefix, order_ids, clock=time.time):
+        last_id = None
+        last = -1
+        for order_id in order_ids:
+            if not isinstance(order_id, str) or not order_id.startswith(prefix + "-"):
+                continue
+            try:
+                number = cls.decode(order_id)
+            except ValueError:
+                continue
+            if number > last:
+                last_id, last = order_id, number
+        return cls(prefix, last_id, clock)
+
+    def next_id(self):
+        with self.lock:
+            self.last = max(int(self.clock()) - ORDER_ID_EPOCH, self.last + 1)
+            number = self.last
+        return self.encode(number)
+
+    __next__ = next_id
+
+    def __iter__(self):
+        return self
+
+    #Fixed width so sorting ids as text also sorts them by time
+    def encode(self, number):
+        digits = []
+        for _ in range(ORDER_ID_DIGITS):
+            number, digit = divmod(number, 32)
+            digits.append(ORDER_ID_ALPHABET[digit])
+        if number:
+            raise OverflowError("order number no longer fits in an order id")
+        return f"{self.prefix}-{''.join(reversed(digits))}"
+
+    #Number inside an order id made by encode, raises ValueError for anything else
+    @staticmethod
+    def decode(order_id):
+        digits = order_id.rsplit("-", 1)[-1]
+        if len(digits) != ORDER_ID_DIGITS:
+            raise ValueError(f"{order_id!r} is not an order id")
+        number = 0
+        for character in digits:
+            number = number * 32 + ORDER_ID_ALPHABET.index(character)
+        return number
+
+#Order id prefix for this kiosk from a --kiosk=NAME option. Without it the machine's host name is used,
+#so kiosks started without the option still hand out different ids
+def kiosk_prefix(argv=None):
+    for arg in (sys.argv if argv is None else argv):
+        if arg.startswith("--kiosk=") and arg.split("=", 1)[1]:
+            return arg.split("=", 1)[1]
+    prefix = "".join(character for character in socket.gethostname().upper() if character.isalnum())
+    if not prefix:
+        raise ValueError("this machine has no usable host name, start the kiosk with --kiosk=NAME")
+    return prefix
+
+#Adding random items to carts and placing orders with no display, reports operations per second
+def benchmark(orders=20000, items_per_order=5, seed=1):
+    rng = random.Random(seed)
+    catalog = Catalog.load()
+    pricer = Pricer(catalog)
+    items = list(catalog.category_of)
+    operations = 0
+    placed = []
+    started = time.perf_counter()
+    for order_number in range(orders):
+        cart = Cart(pricer)
+        for _ in range(items_per_order):
+            item = rng.choice(items)
+            addons = rng.sample(catalog.add_ons, rng.randint(0, 2)) if catalog.needs_add_ons(item) else ()
+            cart.add_item(item, rng.choice(catalog.sizes_for(item)), addons)
+            operations += 1
+        placed.append(Order.from_cart(order_number, cart))
+        operations += 1
+    elapsed = time.perf_counter() - started
+    print(f"{orders} orders, {operations} operations in {elapsed:.2f} s ({operations / elapsed:,.0f} operations/s)")
+    return operations / elapsed
+
+#Memory and attribute access cost of holding many open cart lines, plain dicts against CartLine records
+def memory_benchmark(lines=100000):
+    import tracemalloc
+    results = {}
+    for label, make in (("dict", lambda n: {"price": 950, "quantity": n % 5 + 1}), ("CartLine", lambda n: CartLine(950, n % 5 + 1))):
+        tracemalloc.start()
+        held = [make(n) for n in range(lines)]
+        size, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        started = time.perf_counter()
+        if label == "dict":
+            quantity = sum(line["quantity"] for line in held)
+        else:
+            quantity = sum(line.quantity for line in held)
+        elapsed = time.perf_counter() - started
+        results[label] = size / lines
+        print(f"{label:<9} {lines} lines: {size / lines:6.1f} bytes/line, summing quantities took {elapsed * 1000:.1f} ms ({quantity} items)")
+        del held
+    return results
+
+if __name__ == '__main__':
+    benchmark()
+    memory_benchmark()
@@ -0,0 +1,202 @@
+"""
+Application:    Mamaka Bowls Ordering System - Order Journal
+Developer:      Code Runners
+Date:           4/22/2025
+Purpose:        Keeps a record of every confirmed order in an append-only file. Orders are written by a
+                background thread that groups them so one fsync makes a whole batch durable, and the file
+                is replayed on startup to rebuild the placed orders.
+"""
+#Importing libraries
+import os #file handling and fsync
+import json #one order per line in the journal
+import queue #handing orders to the writer thread
+import threading #background writer and durability events
+import time #flush deadlines and benchmark timing
+from collections import OrderedDict #placed orders in the order they were confirmed
+from MamakaOrderEngine import Order #rebuilding orders from the journal
+
+#The journal the app writes to, kept next to this file
+JOURNAL_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "orders.journal")
+
+#Event set once an appended order has been written, error holds the exception if writing it failed
+class Durability(threading.Event):
+    def __init__(self):
+        super().__init__()
+        self.error = None
+
+    #Waiting for the write, raises if it failed or did not finish within timeout seconds
+    def result(self, timeout=None):
+        if not self.wait(timeout):
+            raise TimeoutError("the order journal did not write the order in time")
+        if self.error is not None:
+            raise self.error
+
+#Append-only order log with group commit. append() returns straight away with an event that is set once
+#the order has been fsynced, the writer waits up to flush_interval seconds for more orders (or until it has
+#batch_size of them) so a busy kiosk pays for one fsync per batch instead of one per order
+class OrderJournal:
+    def __init__(self, path=JOURNAL_FILE, flush_interval=0.05, batch_size=64):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.orders = OrderedDict()
+        self.skipped_lines = []
+        self.syncs = 0
+        #Set when a write fails, the writer stops and every later append raises
+        self.error = None
+        self.lock = threading.Lock()
+        self.replay()
+        self.file = open(path, "ab")
+        self.pending = queue.Queue()
+        self.closed = False
+        self.writer = threading.Thread(target=self.write_loop, name="order-journal", daemon=True)
+        self.writer.start()
+
+    #Rebuilding the placed orders from the journal, a half written last line from a crash is cut off
+    def replay(self):
+        try:
+            with open(self.path, "rb") as journal:
+                data = journal.read()
+        except FileNotFoundError:
+            return
+        complete = data.rfind(b"\n") + 1
+        if complete < len(data):
+            with open(self.path, "r+b") as journal:
+                journal.truncate(complete)
+        for number, line in enumerate(data[:complete].splitlines(), 1):
+            if not line.strip():
+                continue
+            try:
+                order = Order.from_dict(json.loads(line))
+            except (ValueError, KeyError, TypeError):
+                #Keeping the line numbers so a damaged journal can be looked at, the other orders still load
+                self.skipped_lines.append(number)
+                continue
+            self.orders[order.order_id] = order
+
+    #Queueing an order to be written, returns an event that is set once it is safely on disk. The order only
+    #shows up in orders once its batch has been written, so an order that failed to save is never listed
+    def append(self, order):
+        if self.closed:
+            raise ValueError("the order journal is closed")
+        record = (json.dumps(order.to_dict(), separators=(",", ":")) + "\n").encode("utf-8")
+        durable = Durability()
+        with self.lock:
+            self.check_writer()
+            self.pending.put((record, durable, order))
+        return durable
+
+    #Raising if the writer thread has stopped because of a write error
+    def check_writer(self):
+        if self.error is not None:
+            raise OSError(f"the order journal stopped writing: {self.error}") from self.error
+
+    #Blocking until everything appended so far is on disk
+    def sync(self, timeout=None):
+        durable = Durability()
+        with self.lock:
+            self.check_writer()
+            self.pending.put((None, durable, None))
+        return durable.wait(timeout)
+
+    #Writer thread, collects a batch, writes it with one fsync and then marks every order in it durable
+    def write_loop(self):
+        while True:
+            first = self.pending.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            stopping = False
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    entry = self.pending.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if entry is None:
+                    stopping = True
+                    break
+                batch.append(entry)
+            records = [record for record, durable, order in batch if record is not None]
+            try:
+                if records:
+                    self.file.write(b"".join(records))
+                    self.file.flush()
+                    os.fsync(self.file.fileno())
+                    self.syncs += 1
+            except Exception as error:
+                self.fail(batch, error)
+                return
+            with self.lock:
+                for record, durable, order in batch:
+                    if order is not None:
+                        self.orders[order.order_id] = order
+            for record, durable, order in batch:
+                durable.set()
+            if stopping:
+                return
+
+    #Stopping after a write error, the failed batch and everything still queued get the error
+    def fail(self, batch, error):
+        with self.lock:
+            self.error = error
+            while True:
+                try:
+                    entry = self.pending.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is not None:
+                    batch.append(entry)
+        for record, durable, order in batch:
+            durable.error = error
+            durable.set()
+
+    #Writing out anything still queued and closing the file
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.pending.put(None)
+        self.writer.join()
+        self.file.close()
+
+    def __len__(self):
+        return len(self.orders)
+
+    def __contains__(self, order_id):
+        return order_id in self.orders
+
+    def get(self, order_id):
+        return self.orders.get(order_id)
+
+#Appending orders one fsync at a time against group commit, reports orders per second and fsyncs used
+def benchmark(orders=2000, path="journal_benchmark.journal"):
+    from MamakaOrderEngine import Catalog, Pricer, Cart
+    catalog = Catalog.load()
+    cart = Cart(Pricer(catalog))
+    cart.add_item("Mamaka Bowl", "Regular", ["Agave"])
+    cart.add_item("Latte")
+    results = {}
+    for label, batch_size in (("fsync per order", 1), ("group commit", 64)):
+        if os.path.exists(path):
+            os.remove(path)
+        journal = OrderJournal(path, batch_size=batch_size)
+        started = time.perf_counter()
+        waits = [journal.append(Order.from_cart(number, cart)) for number in range(orders)]
+        for durable in waits:
+            durable.wait()
+        elapsed = time.perf_counter() - started
+        journal.close()
+        replay = OrderJournal(path)
+        replayed = len(replay)
+        replay.close()
+        results[label] = orders / elapsed
+        print(f"{label:<16} {orders} orders in {elapsed:.2f} s ({orders / elapsed:,.0f} orders/s, {journal.syncs} fsyncs, {replayed} replayed)")
+    os.remove(path)
+    return results
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,176 @@
+"""
+Application:    Mamaka Bowls Ordering System - Order Store
+Developer:      Code Runners
+Date:           4/22/2025
+Purpose:        Optional SQLite database of placed orders next to the order journal, so staff can look an order
+                up by its id or the customer's phone number however much order history builds up.
+"""
+#Importing libraries
+import os #locating the database file
+import json #customer details are saved as JSON text
+import sqlite3 #the database
+import time #timestamps and benchmark timing
+import random #random phone numbers for the benchmark
+import threading #one thread uses the connection at a time
+from MamakaOrderEngine import Order, OrderLine, Money #rebuilding orders read back from the database
+
+#The database the app writes to, kept next to this file
+ORDER_DB_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "orders.db")
+
+#Order lines are stored without a rowid, keyed by order and line number, so one order's lines sit together on disk
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS orders (
+    order_id TEXT PRIMARY KEY,
+    phone TEXT,
+    customer TEXT NOT NULL,
+    subtotal INTEGER NOT NULL,
+    tax INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    special_request TEXT NOT NULL,
+    placed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS order_lines (
+    order_id TEXT NOT NULL,
+    line_number INTEGER NOT NULL,
+    item TEXT NOT NULL,
+    size TEXT NOT NULL,
+    addons TEXT NOT NULL,
+    price INTEGER NOT NULL,
+    quantity INTEGER NOT NULL,
+    category TEXT,
+    PRIMARY KEY (order_id, line_number)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS orders_by_phone ON orders (phone, placed_at);
+CREATE INDEX IF NOT EXISTS orders_by_placed_at ON orders (placed_at);
+"""
+
+#Placed orders kept in SQLite. The statements below never change, so sqlite3's statement cache prepares each
+#one once per connection and reuses it, and orders are written in batches with executemany in one transaction
+class OrderStore:
+    INSERT_ORDER = "INSERT OR REPLACE INTO orders VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+    DELETE_LINES = "DELETE FROM order_lines WHERE order_id = ?"
+    INSERT_LINE = "INSERT INTO order_lines VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+    SELECT_ORDER = "SELECT * FROM orders WHERE order_id = ?"
+    SELECT_LINES = "SELECT item, size, addons, price, quantity, category FROM order_lines WHERE order_id = ? ORDER BY line_number"
+    SELECT_BY_PHONE = "SELECT * FROM orders WHERE phone = ? ORDER BY placed_at DESC LIMIT ?"
+    SELECT_BETWEEN = "SELECT * FROM orders WHERE placed_at >= ? AND placed_at < ? ORDER BY placed_at"
+
+    def __init__(self, path=ORDER_DB_FILE):
+        self.path = path
+        #The connection may be used from the order submitter's worker threads, the lock lets one in at a time
+        self.connection = sqlite3.connect(path, cached_statements=64, check_same_thread=False)
+        self.lock = threading.RLock()
+        #WAL lets lookups read while orders are being written, NORMAL only syncs at checkpoints which is safe in WAL mode
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        #Databases made before line categories were stored get the column added, their old lines have none
+        columns = [row[1] for row in self.connection.execute("PRAGMA table_info(order_lines)")]
+        if "category" not in columns:
+            with self.connection:
+                self.connection.execute("ALTER TABLE order_lines ADD COLUMN category TEXT")
+
+    #Saving one order
+    def save(self, order):
+        self.save_many((order,))
+
+    #Saving a batch of orders and all their lines in one transaction
+    def save_many(self, orders):
+        order_rows = []
+        line_rows = []
+        for order in orders:
+            order_id = str(order.order_id)
+            order_rows.append((order_id, order.customer.get("phone"), json.dumps(order.customer), order.subtotal.cents,
+                               order.tax.cents, order.total.cents, order.special_request, order.placed_at))
+            line_rows.extend((order_id, number, line.item, line.size, json.dumps(list(line.addons)), line.price_cents, line.quantity,
+                              line.category) for number, line in enumerate(order.lines))
+        with self.lock, self.connection:
+            self.connection.executemany(self.DELETE_LINES, ((row[0],) for row in order_rows))
+            self.connection.executemany(self.INSERT_ORDER, order_rows)
+            self.connection.executemany(self.INSERT_LINE, line_rows)
+
+    #Order with this id, or None
+    def get(self, order_id):
+        with self.lock:
+            row = self.connection.execute(self.SELECT_ORDER, (str(order_id),)).fetchone()
+            return self.build_order(row) if row else None
+
+    #Most recent orders placed with a phone number
+    def find_by_phone(self, phone, limit=20):
+        with self.lock:
+            return [self.build_order(row) for row in self.connection.execute(self.SELECT_BY_PHONE, (phone, limit)).fetchall()]
+
+    #Orders placed from start up to (not including) end, as time.time() timestamps
+    def placed_between(self, start, end):
+        with self.lock:
+            return [self.build_order(row) for row in self.connection.execute(self.SELECT_BETWEEN, (start, end)).fetchall()]
+
+    def build_order(self, row):
+        order_id, phone, customer, subtotal, tax, total, special_request, placed_at = row
+        lines = [OrderLine(item, size, tuple(json.loads(addons)), price, quantity, category)
+                 for item, size, addons, price, quantity, category in self.connection.execute(self.SELECT_LINES, (order_id,))]
+        return Order(order_id, lines, json.loads(customer), Money(subtotal), Money(tax), Money(total), special_request, placed_at)
+
+    def __len__(self):
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM orders").fetchone()[0]
+
+    def close(self):
+        self.connection.close()
+
+#Filling a fresh database with orders in batches, reporting insert throughput as it grows and lookup latency at the end
+def benchmark(orders=1000000, batch_size=1000, lookups=2000, path="store_benchmark.db", seed=1):
+    from MamakaOrderEngine import Catalog, Pricer, Cart
+    rng = random.Random(seed)
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    store = OrderStore(path)
+    catalog = Catalog.load()
+    pricer = Pricer(catalog)
+    #A handful of sample carts reused for every order, the benchmark measures the database not the cart
+    samples = []
+    for _ in range(20):
+        cart = Cart(pricer)
+        for _ in range(rng.randint(1, 4)):
+            item = rng.choice(catalog.items)
+            addons = rng.sample(catalog.add_ons, rng.randint(0, 2)) if catalog.needs_add_ons(item) else ()
+            cart.add_item(item, rng.choice(catalog.sizes_for(item)), addons)
+        samples.append(Order.from_cart(0, cart))
+    phones = [f"555{number:07d}" for number in range(orders // 10 or 1)]
+    placed_at = time.time() - orders
+    report_every = max(orders // 10, batch_size)
+    started = time.perf_counter()
+    window_started = started
+    for first in range(0, orders, batch_size):
+        batch = []
+        for number in range(first, min(first + batch_size, orders)):
+            sample = samples[number % len(samples)]
+            batch.append(Order(f"BENCH{number:08d}", sample.lines, {"phone": rng.choice(phones)}, sample.subtotal,
+                               sample.tax, sample.total, "", placed_at + number))
+        store.save_many(batch)
+        done = first + len(batch)
+        if done % report_every == 0 or done == orders:
+            now = time.perf_counter()
+            inserted = (done - 1) % report_every + 1
+            print(f"{done:>9,} orders stored, last {inserted:,} at {inserted / (now - window_started):,.0f} orders/s")
+            window_started = now
+    elapsed = time.perf_counter() - started
+    print(f"Inserted {orders:,} orders in {elapsed:.1f} s ({orders / elapsed:,.0f} orders/s)")
+    for label, lookup in (("by id", lambda: store.get(f"BENCH{rng.randrange(orders):08d}")),
+                          ("by phone", lambda: store.find_by_phone(rng.choice(phones)))):
+        timings = []
+        for _ in range(lookups):
+            lookup_started = time.perf_counter()
+            lookup()
+            timings.append(time.perf_counter() - lookup_started)
+        timings.sort()
+        print(f"Lookup {label:<9} p50 {timings[len(timings) // 2] * 1000:.3f} ms, p99 {timings[int(len(timings) * 0.99)] * 1000:.3f} ms")
+    store.close()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    return orders / elapsed
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,118 @@
+"""
+Application:    Mamaka Bowls Ordering System - Order Submitter
+Developer:      Code Runners
+Date:           4/22/2025
+Purpose:        Runs the slow work after an order is confirmed (saving it, writing the receipt and passing it on
+                to the kitchen) on worker threads, so the kiosk screen never waits for the disk or the network.
+"""
+#Importing libraries
+import os #receipt folder
+import queue #bounded order queue and completion queue
+import threading #worker threads
+
+#Receipts are written here, one text file per order
+RECEIPT_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "receipts")
+
+#What happened to one submitted order, failures maps a step name to the error it raised
+class Submission:
+    __slots__ = ("order", "failures")
+
+    def __init__(self, order, failures):
+        self.order = order
+        self.failures = failures
+
+    @property
+    def ok(self):
+        return not self.failures
+
+#Bounded pipeline of order steps. The UI thread calls submit() which only queues the order, worker threads
+#run every step for it and put a Submission on the completion queue, and the UI drains that with poll() from
+#an after() timer. When max_pending orders are waiting the queue is full and submit() refuses new orders,
+#busy() says so a little earlier so the screen can ask customers to wait before that happens
+class OrderSubmitter:
+    #Seconds an idle worker waits before checking whether the submitter was closed
+    IDLE_CHECK = 0.2
+
+    def __init__(self, steps=(), workers=2, max_pending=32, busy_level=0.75):
+        self.steps = list(steps)
+        self.max_pending = max_pending
+        self.busy_level = busy_level
+        self.pending = queue.Queue(maxsize=max_pending)
+        self.completed = queue.Queue()
+        self.closed = False
+        self.workers = [threading.Thread(target=self.work, name=f"order-submitter-{number}", daemon=True)
+                        for number in range(workers)]
+        for worker in self.workers:
+            worker.start()
+
+    #Adding a step, called as step(order) on a worker thread for every order
+    def add_step(self, name, step):
+        self.steps.append((name, step))
+
+    #Queueing a confirmed order without waiting, returns False if the queue is full
+    def submit(self, order):
+        if self.closed:
+            return False
+        try:
+            self.pending.put_nowait(order)
+        except queue.Full:
+            return False
+        return True
+
+    #Number of orders waiting for a worker
+    def backlog(self):
+        return self.pending.qsize()
+
+    #True once the backlog reaches busy_level of the queue, new orders should wait
+    def busy(self):
+        return self.backlog() >= self.max_pending * self.busy_level
+
+    #Worker thread, one failing step does not stop the others from running
+    def work(self):
+        while True:
+            try:
+                order = self.pending.get(timeout=self.IDLE_CHECK)
+            except queue.Empty:
+                if self.closed:
+                    return
+                continue
+            failures = {}
+            for name, step in self.steps:
+                try:
+                    step(order)
+                except Exception as error:
+                    failures[name] = error
+            self.completed.put(Submission(order, failures))
+
+    #Finished submissions since the last call, for the UI thread
+    def poll(self):
+        finished = []
+        while True:
+            try:
+                finished.append(self.completed.get_nowait())
+            except queue.Empty:
+                return finished
+
+    #Letting the workers finish the queued orders, then stopping them. Nothing is put on the queue, so closing
+    #works even when it is full, and timeout bounds the wait for each worker if a step is stuck
+    def close(self, timeout=None):
+        if self.closed:
+            return
+        self.closed = True
+        for worker in self.workers:
+            worker.join(timeout)
+
+#Writing a plain text receipt for an order into the receipts folder
+def write_receipt(order, folder=RECEIPT_FOLDER):
+    os.makedirs(folder, exist_ok=True)
+    lines = [f"Mamaka Bowls - Order {order.order_id}", ""]
+    for line in order.lines:
+        addons = f" ({', '.join(line.addons)})" if line.addons else ""
+        lines.append(f"{line.item} ({line.size}){addons} x{line.quantity} - {line.total()}")
+    if order.special_request:
+        lines.append(f"Special request: {order.special_request}")
+    lines += ["", f"Subtotal: {order.subtotal}", f"Tax: {order.tax}", f"Total: {order.total}", ""]
+    path = os.path.join(folder, f"{order.order_id}.txt")
+    with open(path, "w", encoding="utf-8") as receipt:
+        receipt.write("\n".join(lines))
+    return path
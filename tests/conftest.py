@@ -0,0 +1,11 @@
+"""
+Application:    Mamaka Bowls Ordering System - Test Setup
+Developer:      Code Runners
+Date:           4/22/2025
+Purpose:        Lets the tests import the app's modules, which sit in the folder above this one.
+"""
+#Importing libraries
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
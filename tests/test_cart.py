@@ -0,0 +1,65 @@
+"""
+Application:    Mamaka Bowls Ordering System - Cart Tests
+Developer:      Code Runners
+Date:           4/22/2025
+Purpose:        Headless checks of cart line keys, how identical additions merge into one line, and cart totals and tax.
+"""
+#Importing libraries
+import pytest
+from MamakaOrderEngine import Catalog, Pricer, Cart, Money
+
+@pytest.fixture
+def cart():
+    return Cart(Pricer(Catalog.load()))
+
+#The same add-ons in any order give the same key, and the key turns back into the same item
+def test_line_key_ignores_add_on_order(cart):
+    catalog = cart.pricer.catalog
+    key = catalog.line_key("Bro Bowl", "Small", ["Bananas", "Agave"])
+    assert key == catalog.line_key("Bro Bowl", "Small", ["Agave", "Bananas"])
+    assert catalog.line_parts(key) == ("Bro Bowl", "Small", ["Agave", "Bananas"])
+
+#Adding the same item with the same add-ons in any order lands on one line
+def test_cart_merges_identical_lines(cart):
+    first = cart.add_item("Bro Bowl", "Small", ["Agave", "Bananas"])
+    second = cart.add_item("Bro Bowl", "Small", ["Bananas", "Agave"])
+    cart.add_item("Latte")
+    assert first == second
+    assert len(cart) == 2
+    assert cart[first].quantity == 2
+    assert cart.count() == 3
+    assert cart.subtotal() == Money(2 * 1050 + 475)
+
+#A different size or different add-ons is a line of its own
+def test_cart_keeps_different_lines_apart(cart):
+    cart.add_item("Bro Bowl", "Small", ["Agave"])
+    cart.add_item("Bro Bowl", "Regular", ["Agave"])
+    cart.add_item("Bro Bowl", "Small")
+    assert len(cart) == 3
+
+#Totals are kept up to date on every change, and a removed line only takes off what it had
+def test_cart_totals_follow_quantity_changes(cart):
+    key = cart.add_item("Latte", quantity=2)
+    cart.add_item("Bro Bowl", "Small")
+    cart.change_quantity(key, 1)
+    assert cart.subtotal() == Money(3 * 475 + 950)
+    cart.change_quantity(key, -5)
+    assert key not in cart
+    assert cart.subtotal() == Money(950)
+    assert cart.count() == 1
+
+#Tax is 8.25% of the subtotal rounded half up to the cent
+@pytest.mark.parametrize("cents, tax", [(0, 0), (100, 8), (475, 39), (1000, 83), (200, 17), (1600, 132), (-200, -17)])
+def test_tax_rounds_half_up(cents, tax):
+    assert Money(cents).percent(825) == Money(tax)
+
+def test_cart_total_adds_tax(cart):
+    cart.add_item("Latte")
+    cart.add_item("Bro Bowl", "Small", ["Agave"])
+    assert cart.subtotal() == Money(1475)
+    assert cart.tax() == Money(122)
+    assert str(cart.total()) == "$15.97"
+
+def test_money_formats_without_float_rounding():
+    assert str(Money.from_dollars(0.1) + Money.from_dollars(0.2)) == "$0.30"
+    assert str(Money(-5)) == "-$0.05"
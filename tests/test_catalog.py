@@ -0,0 +1,156 @@
+"""
+Application:    Mamaka Bowls Ordering System - Catalog Tests
+Developer:      Code Runners
+Date:           4/22/2025
+Purpose:        Headless checks of loading menu.json, the compiled catalog cache, the menu checks and swapping
+                read-only catalog snapshots at runtime.
+"""
+#Importing libraries
+import copy
+import json
+import os
+import pickle
+import pytest
+from MamakaOrderEngine import Catalog, CatalogStore, MENU_FILE
+
+@pytest.fixture
+def menu():
+    with open(MENU_FILE, encoding="utf-8") as menu_file:
+        return json.load(menu_file)
+
+#A copy of the shipped menu in a temporary folder, so the cache written beside it stays out of the repo
+@pytest.fixture
+def menu_path(tmp_path, menu):
+    path = tmp_path / "menu.json"
+    path.write_text(json.dumps(menu), encoding="utf-8")
+    return str(path)
+
+def test_load_compiles_prices_and_writes_the_cache(menu_path):
+    catalog = Catalog.load(menu_path)
+    assert catalog.price_cents(catalog.line_key("Bro Bowl", "Small", ["Agave"])) == 1000
+    with open(menu_path + ".compiled", "rb") as cache_file:
+        assert cache_file.read()
+
+#While the file is unchanged the cache is used as it is, the menu is not even checked again
+def test_unchanged_menu_comes_from_the_cache(menu_path, monkeypatch):
+    first = Catalog.load(menu_path)
+    monkeypatch.setattr(Catalog, "validate", classmethod(lambda cls, menu, source="menu": pytest.fail("cache not used")))
+    cached = Catalog.load(menu_path)
+    assert cached.version == first.version
+    assert cached.price_cents(cached.line_key("Latte")) == 475
+
+#Changing the file changes its hash, so the stale cache is rebuilt with the new prices
+def test_changed_menu_rebuilds_the_cache(menu_path, menu):
+    first = Catalog.load(menu_path)
+    menu["prices"]["Latte"] = 5.25
+    with open(menu_path, "w", encoding="utf-8") as menu_file:
+        json.dump(menu, menu_file)
+    changed = Catalog.load(menu_path)
+    assert changed.version != first.version
+    assert changed.price_cents(changed.line_key("Latte")) == 525
+    assert Catalog.load(menu_path).version == changed.version
+
+def test_damaged_cache_is_rebuilt(menu_path):
+    Catalog.load(menu_path)
+    with open(menu_path + ".compiled", "wb") as cache_file:
+        cache_file.write(b"not a pickle")
+    catalog = Catalog.load(menu_path)
+    assert catalog.price_cents(catalog.line_key("Latte")) == 475
+    with open(menu_path + ".compiled", "rb") as cache_file:
+        assert cache_file.read() != b"not a pickle"
+
+def test_invalid_json_names_the_file(menu_path):
+    with open(menu_path, "w", encoding="utf-8") as menu_file:
+        menu_file.write("{")
+    with pytest.raises(ValueError, match="not valid JSON"):
+        Catalog.load(menu_path)
+
+#Each broken menu is refused with a ValueError naming the field, not a crash further on
+@pytest.mark.parametrize("breaks, field", [
+    (lambda menu: menu.pop("prices"), "missing prices"),
+    (lambda menu: menu["menu_items"].update(Bowls=[5]), "menu_items"),
+    (lambda menu: menu["menu_items"].update(Coffee=[["x"]]), "menu_items"),
+    (lambda menu: menu["menu_items"].update(Tacos=["Latte"]), "more than one category"),
+    (lambda menu: menu["menu_items"].update(Coffee=["Tea"]), "has no price"),
+    (lambda menu: menu["add_ons"].append(3), "add_ons"),
+    (lambda menu: menu["add_ons"].append("Agave"), "add_ons"),
+    (lambda menu: menu["add_ons"].extend(f"Extra {n}" for n in range(20)), "at most"),
+    (lambda menu: menu["image_aliases"].update(latte=5), "image_aliases"),
+    (lambda menu: menu["prices"].update(Latte="4.75"), "prices"),
+    (lambda menu: menu["prices"].update(Latte=-1), "prices"),
+    (lambda menu: menu["prices"].update(Latte=1e300), "prices"),
+    (lambda menu: menu["prices"].update(Latte=float("inf")), "prices"),
+    (lambda menu: menu["prices"].update(Latte=True), "prices"),
+    (lambda menu: menu["bowl_prices"].pop("Regular"), "Regular"),
+])
+def test_validate_rejects_broken_menus(menu, breaks, field):
+    broken = copy.deepcopy(menu)
+    breaks(broken)
+    with pytest.raises(ValueError, match=field):
+        Catalog.validate(broken)
+
+def test_validate_accepts_the_shipped_menu(menu):
+    assert Catalog.validate(menu)["menu_items"] == menu["menu_items"]
+
+#Rewriting the menu file and moving its modified time on, so the change is seen even within one clock tick
+def rewrite(path, menu, seconds=10):
+    with open(path, "w", encoding="utf-8") as menu_file:
+        json.dump(menu, menu_file)
+    modified = os.stat(path).st_mtime_ns + seconds * 1000000000
+    os.utime(path, ns=(modified, modified))
+
+def test_catalog_snapshot_can_not_be_changed(menu_path):
+    catalog = Catalog.load(menu_path)
+    with pytest.raises(AttributeError):
+        catalog.prices = {}
+    with pytest.raises(TypeError):
+        catalog.prices["Latte"] = 0
+    with pytest.raises(TypeError):
+        catalog.mask_cents[1] = 0
+    with pytest.raises(AttributeError):
+        catalog.items.append("Tea")
+    assert catalog.price_cents(catalog.line_key("Latte")) == 475
+
+#The compiled cache keeps the price tables as arrays and the loaded snapshot is read-only again
+def test_pickled_catalog_is_frozen_again(menu_path):
+    catalog = pickle.loads(pickle.dumps(Catalog.load(menu_path)))
+    assert catalog.mask_cents.readonly and catalog.base_cents.readonly
+    with pytest.raises(TypeError):
+        catalog.bowl_prices["Small"] = 0
+    assert catalog.price_cents(catalog.line_key("Bro Bowl", "Small", ["Agave", "Bananas"])) == 1050
+
+def test_store_reloads_only_when_the_file_changes(menu_path, menu):
+    store = CatalogStore(menu_path)
+    assert store.reload() is None
+    #Forcing reads the file again, an identical menu is still not a new catalog
+    assert store.reload(force=True) is None
+    menu["prices"]["Latte"] = 5.25
+    rewrite(menu_path, menu)
+    catalog = store.reload()
+    assert catalog.price_cents(catalog.line_key("Latte")) == 525
+    assert store.reload() is None
+
+#Swapping only changes what new sessions get, a cart's pricer keeps its own snapshot
+def test_swap_keeps_the_previous_snapshot_intact(menu_path, menu):
+    store = CatalogStore(menu_path)
+    old = store.current
+    menu["prices"]["Latte"] = 5.25
+    rewrite(menu_path, menu)
+    new = store.reload()
+    assert store.swap(new) is old
+    assert store.current is new
+    assert old.price_cents(old.line_key("Latte")) == 475
+
+#A broken file is reported by the reload that finds it, then left alone until the file changes again
+def test_broken_menu_is_reported_once(menu_path, menu):
+    store = CatalogStore(menu_path)
+    broken = copy.deepcopy(menu)
+    broken["menu_items"]["Bowls"] = [5]
+    rewrite(menu_path, broken)
+    with pytest.raises(ValueError, match="menu_items"):
+        store.reload()
+    assert store.reload() is None
+    menu["prices"]["Latte"] = 5.25
+    rewrite(menu_path, menu, seconds=20)
+    catalog = store.reload()
+    assert catalog.price_cents(catalog.line_key("Latte")) == 525
@@ -0,0 +1,127 @@
+"""
+Application:    Mamaka Bowls Ordering System - Kitchen Display Tests
+Developer:      Code Runners
+Date:           4/22/2025
+Purpose:        Headless checks of kitchen tickets and of the kiosk's link to the kitchen display, using a
+                stand-in display on a local socket.
+"""
+#Importing libraries
+import json
+import queue
+import socket
+import threading
+import time
+import pytest
+from MamakaOrderEngine import Catalog, Pricer, Cart, Order
+from MamakaKitchenDisplay import KitchenLink, TicketServer, ticket_for
+
+@pytest.fixture
+def catalog():
+    return Catalog.load()
+
+def ticket(order_id):
+    return {"order_id": order_id, "lines": []}
+
+#Waiting for a condition checked every few milliseconds, fails the test if it never holds
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            pytest.fail("timed out")
+        time.sleep(0.01)
+
+#Reading one ticket per line from a stand-in display connection
+def read_tickets(connection, count):
+    data = b""
+    while data.count(b"\n") < count:
+        chunk = connection.recv(4096)
+        if not chunk:
+            break
+        data += chunk
+    return [json.loads(line) for line in data.splitlines()]
+
+def test_ticket_uses_the_station_recorded_with_the_order(catalog):
+    cart = Cart(Pricer(catalog))
+    cart.add_item("Bro Bowl", "Small", ["Agave"])
+    cart.add_item("Latte")
+    order = Order.from_cart("K1-000001", cart, {"first_name": "Sam", "last_name": "Lee"})
+    order.lines[1].category = "Drinks"
+    sent = ticket_for(order, catalog)
+    assert sent["name"] == "Sam Lee"
+    assert [line["station"] for line in sent["lines"]] == ["Bowls", "Drinks"]
+
+#Orders journaled before categories were recorded fall back to the catalog, or to Other without one
+def test_ticket_falls_back_to_the_catalog(catalog):
+    cart = Cart(Pricer(catalog))
+    cart.add_item("Latte")
+    order = Order.from_cart("K1-000001", cart)
+    order.lines[0].category = None
+    assert ticket_for(order, catalog)["lines"][0]["station"] == "Coffee"
+    assert ticket_for(order)["lines"][0]["station"] == "Other"
+
+#The display goes away after acknowledging only the first ticket, the second is sent again once it is back
+def test_link_resends_unacknowledged_tickets_after_a_reconnect():
+    listener = socket.create_server(("127.0.0.1", 0))
+    address = listener.getsockname()
+    link = KitchenLink(address, retry_delay=0.05, max_retry_delay=0.2, timeout=1)
+    try:
+        link.send(ticket("K1-000001"))
+        link.send(ticket("K1-000002"))
+        connection, _ = listener.accept()
+        assert [sent["order_id"] for sent in read_tickets(connection, 2)] == ["K1-000001", "K1-000002"]
+        connection.sendall(b'"K1-000001"\n')
+        wait_for(lambda: "K1-000001" not in link.unacked)
+        connection.shutdown(socket.SHUT_RDWR)
+        connection.close()
+        listener.close()
+
+        received = queue.Queue()
+        server = TicketServer(address, received)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            assert received.get(timeout=5)["order_id"] == "K1-000002"
+            wait_for(lambda: not link.unacked)
+            assert received.empty()
+            assert link.dropped == 0
+        finally:
+            server.shutdown()
+            server.server_close()
+    finally:
+        link.close()
+
+#Tickets sent while the display is down wait in the buffer and arrive once it starts
+def test_link_buffers_tickets_until_the_display_starts():
+    probe = socket.create_server(("127.0.0.1", 0))
+    address = probe.getsockname()
+    probe.close()
+    link = KitchenLink(address, retry_delay=0.05, max_retry_delay=0.2, timeout=1)
+    try:
+        for number in range(3):
+            link.send(ticket(f"K1-00000{number}"))
+        time.sleep(0.2)
+        assert not link.connected
+        received = queue.Queue()
+        server = TicketServer(address, received)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            assert sorted(received.get(timeout=5)["order_id"] for _ in range(3)) == ["K1-000000", "K1-000001", "K1-000002"]
+            wait_for(lambda: not link.unacked)
+        finally:
+            server.shutdown()
+            server.server_close()
+    finally:
+        link.close()
+
+#When the display stays away and the buffer fills, the oldest tickets are dropped and counted
+def test_link_drops_the_oldest_tickets_when_the_buffer_is_full():
+    probe = socket.create_server(("127.0.0.1", 0))
+    address = probe.getsockname()
+    probe.close()
+    link = KitchenLink(address, max_buffer=3, retry_delay=0.05, max_retry_delay=0.2, timeout=1)
+    try:
+        for number in range(5):
+            link.send(ticket(f"K1-00000{number}"))
+        assert link.dropped == 2
+        assert list(link.unacked) == ["K1-000002", "K1-000003", "K1-000004"]
+    finally:
+        link.close()
@@ -0,0 +1,62 @@
+"""
+Application:    Mamaka Bowls Ordering System - Order Id Tests
+Developer:      Code Runners
+Date:           4/22/2025
+Purpose:        Headless checks that order ids stay unique across threads, restarts and kiosks.
+"""
+#Importing libraries
+import threading
+import pytest
+import MamakaOrderEngine
+from MamakaOrderEngine import OrderIdGenerator, kiosk_prefix
+
+def test_order_ids_are_unique_across_threads():
+    generator = OrderIdGenerator("K1")
+    ids = []
+    lock = threading.Lock()
+
+    def take():
+        taken = [generator.next_id() for _ in range(2000)]
+        with lock:
+            ids.extend(taken)
+
+    threads = [threading.Thread(target=take) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(ids)) == len(ids) == 16000
+
+#A restart carries on after the last id in the journal, even if the clock went back, and skips ids it can not read
+def test_order_ids_continue_after_a_restart():
+    clock = [1800000000.0]
+    first = OrderIdGenerator("K1", clock=lambda: clock[0])
+    used = [first.next_id() for _ in range(5)]
+    clock[0] -= 60
+    resumed = OrderIdGenerator.resume("K1", used + ["K1-bad", "K1-00000I", "K2-ZZZZZZ", 42], clock=lambda: clock[0])
+    next_id = resumed.next_id()
+    assert next_id not in used
+    assert next_id > max(used)
+
+def test_order_ids_follow_the_clock():
+    clock = [1800000000.0]
+    generator = OrderIdGenerator("K1", clock=lambda: clock[0])
+    earlier = generator.next_id()
+    clock[0] += 3600
+    later = generator.next_id()
+    assert OrderIdGenerator.decode(later) - OrderIdGenerator.decode(earlier) == 3600
+
+def test_order_id_round_trips_through_decode():
+    generator = OrderIdGenerator("K1")
+    assert generator.decode(generator.encode(123456)) == 123456
+    with pytest.raises(ValueError):
+        OrderIdGenerator.decode("K1-12345")
+
+#Two kiosks in the same second never share an id because their prefixes differ
+def test_kiosk_prefix_defaults_to_the_host_name(monkeypatch):
+    monkeypatch.setattr(MamakaOrderEngine.socket, "gethostname", lambda: "front-counter.local")
+    assert kiosk_prefix([]) == "FRONTCOUNTERLOCAL"
+    assert kiosk_prefix(["app.py", "--kiosk=K7"]) == "K7"
+    monkeypatch.setattr(MamakaOrderEngine.socket, "gethostname", lambda: "")
+    with pytest.raises(ValueError, match="--kiosk"):
+        kiosk_prefix([])
@@ -0,0 +1,96 @@
+"""
+Application:    Mamaka Bowls Ordering System - Order Journal Tests
+Developer:      Code Runners
+Date:           4/22/2025
+Purpose:        Headless checks of group commit, replay after a crash and how write failures are reported.
+"""
+#Importing libraries
+import pytest
+from MamakaOrderEngine import Catalog, Pricer, Cart, Order
+from MamakaOrderJournal import OrderJournal
+
+@pytest.fixture
+def cart():
+    cart = Cart(Pricer(Catalog.load()))
+    cart.add_item("Latte")
+    return cart
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "orders.journal")
+
+def place(cart, order_id):
+    return Order.from_cart(order_id, cart, {"phone": "5550000000"})
+
+#Orders appended together share an fsync, and every one of them is replayed after a restart
+def test_group_commit_makes_every_order_durable(path, cart):
+    journal = OrderJournal(path, batch_size=16)
+    waits = [journal.append(place(cart, f"K1-{number:06d}")) for number in range(40)]
+    for durable in waits:
+        durable.result(5)
+    journal.close()
+    assert journal.syncs < 40
+    replayed = OrderJournal(path)
+    replayed.close()
+    assert len(replayed) == 40
+
+def test_journal_replays_orders_and_drops_a_truncated_last_line(path, cart):
+    journal = OrderJournal(path)
+    for order_id in ("K1-000001", "K1-000002"):
+        journal.append(place(cart, order_id))
+    assert journal.sync(5)
+    journal.close()
+    #A crash in the middle of a write leaves half a line at the end
+    with open(path, "ab") as journal_file:
+        journal_file.write(b'{"order_id": "K1-0000')
+
+    replayed = OrderJournal(path)
+    replayed.close()
+    assert list(replayed.orders) == ["K1-000001", "K1-000002"]
+    assert replayed.get("K1-000002").total == cart.total()
+    assert replayed.skipped_lines == []
+    with open(path, "rb") as journal_file:
+        assert journal_file.read().endswith(b"}\n")
+
+#A damaged line in the middle is skipped and its line number kept, the orders around it still load
+def test_journal_skips_damaged_lines(path, cart):
+    journal = OrderJournal(path)
+    journal.append(place(cart, "K1-000001")).result(5)
+    journal.close()
+    with open(path, "ab") as journal_file:
+        journal_file.write(b'{"order_id": "K1-000002"}\n')
+    journal = OrderJournal(path)
+    journal.append(place(cart, "K1-000003")).result(5)
+    journal.close()
+
+    replayed = OrderJournal(path)
+    replayed.close()
+    assert list(replayed.orders) == ["K1-000001", "K1-000003"]
+    assert replayed.skipped_lines == [2]
+
+#A failed write is raised to whoever waits on the order, the order is not listed and later appends raise
+def test_write_failure_is_reported_and_not_journaled(path, cart):
+    journal = OrderJournal(path)
+    journal.append(place(cart, "K1-000001")).result(5)
+    journal.file.close()
+    durable = journal.append(place(cart, "K1-000002"))
+    with pytest.raises(ValueError):
+        durable.result(5)
+    assert "K1-000001" in journal
+    assert "K1-000002" not in journal
+    with pytest.raises(OSError):
+        journal.append(place(cart, "K1-000003"))
+    journal.close()
+
+    replayed = OrderJournal(path)
+    replayed.close()
+    assert list(replayed.orders) == ["K1-000001"]
+
+#An order is only listed once its batch is on disk
+def test_order_is_listed_once_durable(path, cart):
+    journal = OrderJournal(path, flush_interval=0.5)
+    durable = journal.append(place(cart, "K1-000001"))
+    assert "K1-000001" not in journal
+    durable.result(5)
+    assert journal.get("K1-000001").order_id == "K1-000001"
+    journal.close()
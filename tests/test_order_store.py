@@ -0,0 +1,69 @@
+"""
+Application:    Mamaka Bowls Ordering System - Order Store Tests
+Developer:      Code Runners
+Date:           4/22/2025
+Purpose:        Headless checks that orders saved to the SQLite order store read back the same.
+"""
+#Importing libraries
+import pytest
+from MamakaOrderEngine import Catalog, Pricer, Cart, Order
+from MamakaOrderStore import OrderStore
+
+@pytest.fixture
+def store(tmp_path):
+    store = OrderStore(str(tmp_path / "orders.db"))
+    yield store
+    store.close()
+
+@pytest.fixture
+def cart():
+    cart = Cart(Pricer(Catalog.load()))
+    cart.add_item("Bro Bowl", "Small", ["Agave", "Bananas"])
+    cart.add_item("Latte", quantity=2)
+    cart.special_request = "No ice"
+    return cart
+
+def place(cart, order_id, phone, placed_at):
+    order = Order.from_cart(order_id, cart, {"first_name": "Sam", "phone": phone})
+    order.placed_at = placed_at
+    return order
+
+def test_saved_order_reads_back_the_same(store, cart):
+    order = place(cart, "K1-000001", "5550000001", 1000.0)
+    store.save(order)
+    loaded = store.get("K1-000001")
+    assert loaded.to_dict() == order.to_dict()
+    assert loaded.lines[0].addons == ("Agave", "Bananas")
+    assert store.get("K1-000002") is None
+
+#Saving an order again replaces it and its lines instead of adding more
+def test_saving_again_replaces_the_order(store, cart):
+    store.save(place(cart, "K1-000001", "5550000001", 1000.0))
+    cart.clear()
+    cart.add_item("Matcha")
+    store.save(place(cart, "K1-000001", "5550000001", 1000.0))
+    assert len(store) == 1
+    assert [line.item for line in store.get("K1-000001").lines] == ["Matcha"]
+
+def test_find_by_phone_returns_newest_first(store, cart):
+    store.save_many([place(cart, f"K1-00000{number}", "5550000001" if number % 2 else "5550000002", 1000.0 + number)
+                     for number in range(1, 7)])
+    found = store.find_by_phone("5550000001")
+    assert [order.order_id for order in found] == ["K1-000005", "K1-000003", "K1-000001"]
+    assert [order.order_id for order in store.find_by_phone("5550000001", limit=1)] == ["K1-000005"]
+    assert store.find_by_phone("5559999999") == []
+
+#The end of the range is not included
+def test_placed_between_covers_a_time_range(store, cart):
+    store.save_many([place(cart, f"K1-00000{number}", "5550000001", 1000.0 + number) for number in range(1, 6)])
+    assert [order.order_id for order in store.placed_between(1002.0, 1004.0)] == ["K1-000002", "K1-000003"]
+
+#Orders survive closing and opening the database again
+def test_orders_persist_across_connections(tmp_path, cart):
+    path = str(tmp_path / "orders.db")
+    store = OrderStore(path)
+    store.save(place(cart, "K1-000001", "5550000001", 1000.0))
+    store.close()
+    reopened = OrderStore(path)
+    assert reopened.get("K1-000001").total == cart.total()
+    reopened.close()
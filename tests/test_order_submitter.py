@@ -0,0 +1,61 @@
+"""
+Application:    Mamaka Bowls Ordering System - Order Submitter Tests
+Developer:      Code Runners
+Date:           4/22/2025
+Purpose:        Headless checks that the order submitter reports failing steps and refuses orders when full.
+"""
+#Importing libraries
+import threading
+import time
+from MamakaOrderSubmitter import OrderSubmitter, write_receipt
+from MamakaOrderEngine import Catalog, Pricer, Cart, Order
+
+def test_submitter_reports_step_failures():
+    ran = []
+
+    def broken(order):
+        raise OSError("disk full")
+
+    submitter = OrderSubmitter([("journal", broken), ("receipt", ran.append)], workers=1)
+    assert submitter.submit("order-1")
+    submitter.close(timeout=5)
+    finished = submitter.poll()
+    assert len(finished) == 1
+    assert not finished[0].ok
+    assert isinstance(finished[0].failures["journal"], OSError)
+    #A failing step does not stop the steps after it
+    assert ran == ["order-1"]
+
+def test_submitter_refuses_orders_when_full():
+    release = threading.Event()
+    submitter = OrderSubmitter([("stuck", lambda order: release.wait())], workers=1, max_pending=2)
+    accepted = [submitter.submit(number) for number in range(6)]
+    assert accepted.count(False) >= 3
+    assert submitter.busy()
+    release.set()
+    started = time.perf_counter()
+    submitter.close(timeout=5)
+    assert time.perf_counter() - started < 5
+
+#Every step runs for every order, the ones that worked come back with no failures
+def test_submitter_runs_every_step():
+    seen = []
+    submitter = OrderSubmitter([("first", seen.append), ("second", seen.append)], workers=2)
+    for number in range(5):
+        assert submitter.submit(number)
+    submitter.close(timeout=5)
+    finished = submitter.poll()
+    assert sorted(submission.order for submission in finished) == [0, 1, 2, 3, 4]
+    assert all(submission.ok for submission in finished)
+    assert sorted(seen) == sorted(list(range(5)) * 2)
+    assert not submitter.submit(5)
+
+def test_receipt_lists_the_order(tmp_path):
+    cart = Cart(Pricer(Catalog.load()))
+    cart.add_item("Latte", quantity=2)
+    path = write_receipt(Order.from_cart("K1-000001", cart), str(tmp_path))
+    with open(path, encoding="utf-8") as receipt:
+        text = receipt.read()
+    assert "Order K1-000001" in text
+    assert "Latte (Regular) x2 - $9.50" in text
+    assert f"Total: {cart.total()}" in text